@@ -1,153 +1,61 @@
-from collections import defaultdict
-from json import loads
 from pathlib import Path
 from pprint import pprint
-from typing import List
 
 import click
 import pandas
 from bs4 import BeautifulSoup, ResultSet, Tag
 from pandas import DataFrame, Series
-from pandas.core.groupby import DataFrameGroupBy
 
+from src.analytics import Analytics
 from src.types import SearchResultsDF
+from src.utils import loads
 
 
-def countSearchResultsPerYear(df: DataFrame, journal: str) -> Series:
-    data: dict[int, int] = defaultdict(int)
-    dfgb: DataFrameGroupBy = df.groupby(by="year")
-
-    year: int
-    _df: DataFrame
-    row: DataFrame
-    for year, _df in dfgb:
-        uniqueSearchQueriesDF: DataFrame = _df.drop_duplicates(
-            subset="query",
-            keep="first",
-            ignore_index=True,
-        )
-
-        for _, row in uniqueSearchQueriesDF.iterrows():
-            count: int = 0
-            if journal == "science":
-                count += row["count"]
-
-            if journal == "plos":
-                count = int(loads(s=row["html"])["searchResults"]["numFound"])
-
-            if journal == "nature":
-                soup: BeautifulSoup = BeautifulSoup(
-                    markup=row["html"],
-                    features="lxml",
-                )
-                tags: ResultSet[Tag] = soup.find_all(
-                    name="span",
-                    attrs={"data-test": "results-data"},
-                )
-                try:
-                    content: str = tags[-1].text
-                except IndexError:
-                    count = 0
-                else:
-                    resultsContent: List[str] = content.split(sep="of")[-1]
-                    results = resultsContent.strip().split(sep=" ")[0]
-                    count = int(results)
-
-            data[year] += count
-
-    return Series(data=data)
-
-
-def countSearchResultsPerQuery(df: DataFrame, journal: str) -> Series:
-    data: dict[str, int] = defaultdict(int)
-    dfgb: DataFrameGroupBy = df.groupby(by="query")
-
-    query: str
-    _df: DataFrame
-    row: DataFrame
-    for query, _df in dfgb:
-        uniqueYearsDF: DataFrame = _df.drop_duplicates(
-            subset="year",
-            keep="first",
-            ignore_index=True,
-        )
-
-        for _, row in uniqueYearsDF.iterrows():
-            count: int = 0
-
-            if journal == "science":
-                count += row["count"]
-
-            if journal == "plos":
-                count = int(loads(s=row["html"])["searchResults"]["numFound"])
-
-            if journal == "nature":
-                soup: BeautifulSoup = BeautifulSoup(
-                    markup=row["html"],
-                    features="lxml",
-                )
-                tags: ResultSet[Tag] = soup.find_all(
-                    name="span",
-                    attrs={"data-test": "results-data"},
-                )
-                try:
-                    content: str = tags[-1].text
-                except IndexError:
-                    count = 0
-                else:
-                    resultsContent: List[str] = content.split(sep="of")[-1]
-                    results = resultsContent.strip().split(sep=" ")[0]
-                    count = int(results)
-
-            data[query] += count
-
-    return Series(data=data)
-
-
-def countSearchResultsPerYearPerQuery(df: DataFrame, journal: str) -> Series:
-    data: dict[int, dict[str, int]] = {}
-    dfgb: DataFrameGroupBy = df.groupby(by="year")
-
-    year: int
-    _df: DataFrame
-    row: DataFrame
-    for year, _df in dfgb:
-        data[year] = {}
-        uniqueSearchQueriesDF: DataFrame = _df.drop_duplicates(
-            subset="query",
-            keep="first",
-            ignore_index=True,
-        )
-
-        for _, row in uniqueSearchQueriesDF.iterrows():
-            count: int = 0
-            if journal == "science":
-                count += row["count"]
-
-            if journal == "plos":
-                count = int(loads(s=row["html"])["searchResults"]["numFound"])
-
-            if journal == "nature":
-                soup: BeautifulSoup = BeautifulSoup(
-                    markup=row["html"],
-                    features="lxml",
-                )
-                tags: ResultSet[Tag] = soup.find_all(
-                    name="span",
-                    attrs={"data-test": "results-data"},
-                )
-                try:
-                    content: str = tags[-1].text
-                except IndexError:
-                    count = 0
-                else:
-                    resultsContent: List[str] = content.split(sep="of")[-1]
-                    results = resultsContent.strip().split(sep=" ")[0]
-                    count = int(results)
-
-            data[year][row["query"]] = count
-
-    return Series(data=data)
+def countSearchResults(row: Series, journal: str) -> int:
+    """
+    Number of results reported by the search engine on a results page
+    """
+    if journal == "science":
+        return int(row["count"])
+
+    if journal == "plos":
+        return int(loads(s=row["html"])["searchResults"]["numFound"])
+
+    soup: BeautifulSoup = BeautifulSoup(markup=row["html"], features="lxml")
+    tags: ResultSet[Tag] = soup.find_all(
+        name="span",
+        attrs={"data-test": "results-data"},
+    )
+    try:
+        content: str = tags[-1].text
+    except IndexError:
+        return 0
+
+    resultsContent: str = content.split(sep="of")[-1]
+    return int(resultsContent.strip().split(sep=" ")[0])
+
+
+def extractSearchResultCounts(df: DataFrame, journal: str) -> DataFrame:
+    """
+    The reported result count of each (year, query) search, parsed once from
+    the first page stored for it
+    """
+    firstPagesDF: DataFrame = df.drop_duplicates(
+        subset=["year", "query"],
+        keep="first",
+        ignore_index=True,
+    )
+
+    return DataFrame(
+        data={
+            "year": firstPagesDF["year"],
+            "query": firstPagesDF["query"],
+            "count": [
+                countSearchResults(row=row, journal=journal)
+                for _, row in firstPagesDF.iterrows()
+            ],
+        }
+    )
 
 
 @click.command()
@@ -193,18 +101,42 @@ def main(journal: str, inputFP: Path) -> None:
 
     SearchResultsDF(df_dict=df.to_dict(orient="records"))
 
+    analytics: Analytics = Analytics()
+    analytics.register(
+        name="search_counts",
+        source=extractSearchResultCounts(df=df, journal=journal),
+    )
+
     print(f"{journal} Data\n===")
-    results: Series = countSearchResultsPerYear(df=df, journal=journal)
+    results: Series = analytics.sql(
+        query="""
+        SELECT year, CAST(SUM(count) AS BIGINT) AS count
+        FROM search_counts
+        GROUP BY year ORDER BY year
+        """
+    ).set_index(keys="year")["count"]
     total: int = results.sum()
     print(f"Results Per Year\n{results}\nTotal: {total}\n===")
 
-    results: Series = countSearchResultsPerQuery(df=df, journal=journal)
+    results: Series = analytics.sql(
+        query="""
+        SELECT query, CAST(SUM(count) AS BIGINT) AS count
+        FROM search_counts
+        GROUP BY query ORDER BY query
+        """
+    ).set_index(keys="query")["count"]
     total: int = results.sum()
     print(f"Results Per Query\n{results}\nTotal: {total}\n===")
 
-    results: Series = countSearchResultsPerYearPerQuery(df=df, journal=journal)
+    results: DataFrame = analytics.sql(
+        query="""
+        PIVOT search_counts ON query USING CAST(SUM(count) AS BIGINT)
+        GROUP BY year
+        ORDER BY year
+        """
+    ).set_index(keys="year")
     print("Results Per Year Per Query")
-    pprint(results.to_dict(), indent=4)
+    pprint(results.to_dict(orient="index"), indent=4)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Iterator, List, Tuple
+
+import click
+from bs4 import BeautifulSoup, ResultSet, Tag
+from pandas import DataFrame, Series
+from sqlalchemy import Table
+
+from src.db import DB
+from src.journals.nature import (
+    NATURE_DOI_PREFIX,
+    extractMaxPage,
+    extractSearchResultDOIs,
+)
+
+Extractor = Callable[[str], List[str] | int | None]
+
+
+def soupSearchResultDOIs(html: str) -> List[str]:
+    """
+    The BeautifulSoup implementation replaced by extractSearchResultDOIs
+    """
+    soup: BeautifulSoup = BeautifulSoup(markup=html, features="lxml")
+    tags: ResultSet[Tag] = soup.find_all(
+        name="a",
+        attrs={"class": "c-card__link"},
+    )
+    return [
+        NATURE_DOI_PREFIX + tag.get(key="href").split("/")[-1] for tag in tags
+    ]
+
+
+def soupMaxPage(html: str) -> int | None:
+    """
+    The BeautifulSoup implementation replaced by extractMaxPage
+    """
+    soup: BeautifulSoup = BeautifulSoup(markup=html, features="lxml")
+    nextPages: ResultSet[Tag] = soup.find_all(
+        name="li",
+        attrs={"class": "c-pagination__item"},
+    )
+
+    if len(nextPages) < 2 or nextPages[-2].get(key="data-page") is None:
+        return None
+
+    return int(nextPages[-2].get(key="data-page"))
+
+
+def syntheticPage(page: int, cards: int = 50, padding: int = 8000) -> str:
+    """
+    A search results page shaped like nature.com's, about 300 KB
+    """
+    articles: str = "".join(
+        f'<li class="app-article-list-row__item"><article class="c-card">'
+        f'<h3><a class="c-card__link u-link-inherit" '
+        f'href="/articles/s41586-0{page:02d}-{idx:05d}-x">Article {idx}</a>'
+        f"</h3><p>{'Lorem ipsum dolor sit amet. ' * 20}</p></article></li>"
+        for idx in range(cards)
+    )
+    pagination: str = "".join(
+        f'<li class="c-pagination__item" data-page="{idx}">'
+        f'<a href="?page={idx}">{idx}</a></li>'
+        for idx in range(1, 21)
+    )
+    filler: str = '<div class="c-meta">filler</div>' * padding
+
+    return (
+        f"<html><head><title>Search</title></head><body>{filler}"
+        f"<ul>{articles}</ul><ul>{pagination}"
+        '<li class="c-pagination__item" data-page="next">'
+        '<a href="?page=2">Next</a></li></ul></body></html>'
+    )
+
+
+def readNaturePages(fp: Path, limit: int) -> List[str]:
+    db: DB = DB(fp=fp)
+
+    journalIDs: Series = db.keyMap(dimension="journal")
+    responses: Table = db.table(name="search_responses")
+
+    # Only the first chunk is read, so no more than limit rows and payloads
+    # are loaded from the database
+    chunks: Iterator[DataFrame] = db.readTableToDF(
+        table="search_responses",
+        columns=["html"],
+        where=(responses.c.journal == int(journalIDs["Nature"]))
+        & (responses.c.status_code == 200),
+        chunksize=limit,
+    )
+
+    df: DataFrame | None = next(chunks, None)
+    chunks.close()
+
+    return [] if df is None else df["html"].to_list()
+
+
+def timeExtractor(
+    extractor: Extractor,
+    pages: List[str],
+) -> float:
+    start: float = perf_counter()
+
+    page: str
+    for page in pages:
+        extractor(page)
+
+    return perf_counter() - start
+
+
+@click.command()
+@click.option(
+    "-d",
+    "--db",
+    "dbPath",
+    type=Path,
+    required=False,
+    default=None,
+    help="AIUS database to read stored Nature search pages from (default: synthetic 300 KB pages)",  # noqa: E501
+)
+@click.option(
+    "-n",
+    "--pages",
+    "pageCount",
+    type=int,
+    default=200,
+    help="Number of pages to parse",
+)
+def main(dbPath: Path | None, pageCount: int) -> None:
+    pages: List[str] = (
+        readNaturePages(fp=dbPath, limit=pageCount)
+        if dbPath is not None
+        else [syntheticPage(page=idx) for idx in range(pageCount)]
+    )
+
+    if len(pages) == 0:
+        print("No Nature search pages to benchmark")
+        return None
+
+    extractors: List[Tuple[str, Extractor, Extractor]] = [
+        ("DOIs", extractSearchResultDOIs, soupSearchResultDOIs),
+        ("Max page", extractMaxPage, soupMaxPage),
+    ]
+
+    name: str
+    fast: Extractor
+    slow: Extractor
+    for name, fast, slow in extractors:
+        idx: int
+        page: str
+        for idx, page in enumerate(pages):
+            if fast(page) != slow(page):
+                raise click.ClickException(
+                    f"{name}: lxml and BeautifulSoup disagree on page {idx}"
+                )
+
+    size: float = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {size:.0f} KB on average\n===")
+
+    for name, fast, slow in extractors:
+        fastTime: float = timeExtractor(extractor=fast, pages=pages)
+        slowTime: float = timeExtractor(extractor=slow, pages=pages)
+        print(
+            f"{name}: lxml {fastTime:.2f}s, BeautifulSoup {slowTime:.2f}s "
+            f"({slowTime / fastTime:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
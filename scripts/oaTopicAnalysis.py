@@ -4,10 +4,10 @@ from typing import List
 
 import click
 import matplotlib.pyplot as plt
-import pandas
 import seaborn as sns  # Import seaborn explicitly
-from numpy import ndarray
-from pandas import DataFrame
+from pandas import Series
+
+from src.analytics import Analytics
 
 
 def plotOATagCounts(data: dict[str, List[str | int]], fp: Path) -> None:
@@ -52,26 +52,38 @@ def plotOATagCounts(data: dict[str, List[str | int]], fp: Path) -> None:
     help="Path to save figure (PNG)",
 )
 def main(inputPath: Path, outputPath: Path) -> None:
-    df: DataFrame = pandas.read_csv(filepath_or_buffer=inputPath)
-
-    uniqueTopics: ndarray = df["topic_name"].unique()
-    uniqueSubfields: ndarray = df["subfield_name"].unique()
-    uniqueFields: ndarray = df["field_name"].unique()
-    uniqueDomains: ndarray = df["domain_name"].unique()
+    analytics: Analytics = Analytics()
+    analytics.register(name="topics", source=inputPath)
+
+    counts: Series = analytics.sql(
+        query="""
+        SELECT COUNT(DISTINCT topic_name) AS topics,
+            COUNT(DISTINCT subfield_name) AS subfields,
+            COUNT(DISTINCT field_name) AS fields,
+            COUNT(DISTINCT domain_name) AS domains
+        FROM topics
+        """
+    ).iloc[0]
 
     data: dict[str, List[str | int]] = {
         "category": ["Topics", "Subfields", "Fields", "Domains"],
         "value": [
-            uniqueTopics.size,
-            uniqueSubfields.size,
-            uniqueFields.size,
-            uniqueDomains.size,
+            int(counts["topics"]),
+            int(counts["subfields"]),
+            int(counts["fields"]),
+            int(counts["domains"]),
         ],
     }
 
     plotOATagCounts(data=data, fp=outputPath)
 
-    print(uniqueFields.tolist())
+    print(
+        analytics.sql(
+            query="""
+            SELECT DISTINCT field_name FROM topics ORDER BY field_name
+            """
+        )["field_name"].tolist()
+    )
 
 
 if __name__ == "__main__":
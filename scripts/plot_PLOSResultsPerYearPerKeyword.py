@@ -1,49 +1,43 @@
-from typing import List
+from pathlib import Path
 from warnings import filterwarnings
 
 import matplotlib.pyplot as plt
-import pandas
-from pandas import DataFrame, Series, Timestamp
-
-filterwarnings(action="ignore")
+from pandas import DataFrame
 
+from src.analytics import Analytics
 
-def formatData(df: DataFrame) -> DataFrame:
-    data: dict[str, List[str]] = {"year": []}
+filterwarnings(action="ignore")
 
-    foo: DataFrame = df[["publication_date", "queryURL"]]
 
-    foo["year"] = df["publication_date"].apply(lambda x: Timestamp(x).year)
-    foo["query"] = df["queryURL"].apply(
-        lambda x: x.split("&")[-1].split("=")[-1].replace('"', "")
+def formatData(analytics: Analytics) -> DataFrame:
+    """
+    Documents per search query (columns) per publication year (rows); the
+    query is the last parameter of each document's queryURL
+    """
+    return analytics.sql(
+        query="""
+        PIVOT (
+            SELECT YEAR(CAST(publication_date AS DATE)) AS year,
+                REPLACE(REGEXP_EXTRACT(queryURL, '[^&=]*$'), '"', '')
+                    AS query
+            FROM plos_documents
+        )
+        ON query
+        USING COUNT(*)
+        GROUP BY year
+        ORDER BY year
+        """
     )
-    foo = foo.drop(columns=["publication_date", "queryURL"])
-
-    data["year"] = foo["year"].unique().tolist()
-
-    for query in foo["query"].unique():
-        data[query] = []
-
-    for year in data["year"]:
-        bar: DataFrame = foo[foo["year"] == year]
-        values: Series = bar["query"].value_counts()
-
-        for query in foo["query"].unique():
-            try:
-                data[query].append(values[query])
-            except KeyError:
-                data[query].append(0)
-
-    return DataFrame(data=data)
 
 
 def main() -> None:
-    df: DataFrame = pandas.read_parquet(
-        path="../data/plos/plos_documents.parquet",
-        engine="pyarrow",
+    analytics: Analytics = Analytics()
+    analytics.register(
+        name="plos_documents",
+        source=Path("../data/plos/plos_documents.parquet"),
     )
 
-    dfData: DataFrame = formatData(df=df)
+    dfData: DataFrame = formatData(analytics=analytics)
 
     dfData.plot(x="year")
     plt.title(label="Documents per Search Query per Year")
@@ -1,9 +1,11 @@
+from pathlib import Path
 from typing import List
 
 import matplotlib.pyplot as plt
-import pandas
 import seaborn as sns
-from pandas import DataFrame, Series, Timestamp
+from pandas import DataFrame
+
+from src.analytics import Analytics
 
 PAPERS_PER_YEAR: dict[int, int] = {
     2014: 35356,
@@ -22,15 +24,14 @@ PAPERS_PER_YEAR: dict[int, int] = {
 # 2024 count from 9-20-2024
 
 
-def computeProportion(vc: Series) -> dict[int, float]:
-    totalPapers: List[int] = list(PAPERS_PER_YEAR.values())
-    years: List[int] = list(PAPERS_PER_YEAR.keys())
-
+def computeProportion(yearCounts: DataFrame) -> dict[int, float]:
     proportions: dict[int, float] = {}
 
-    value: int
-    for value in vc:
-        proportions[years.pop(0)] = (value / totalPapers.pop(0)) * 100
+    year: int
+    count: int
+    for year, count in yearCounts.itertuples(index=False):
+        if year in PAPERS_PER_YEAR:
+            proportions[year] = (count / PAPERS_PER_YEAR[year]) * 100
 
     return proportions
 
@@ -61,16 +62,23 @@ def plot(proportions: dict[int, float]) -> None:
 
 
 def main() -> None:
-    df: DataFrame = pandas.read_parquet(
-        path="../data/plos/plos_documents.parquet",
-        engine="pyarrow",
+    analytics: Analytics = Analytics()
+    analytics.register(
+        name="plos_documents",
+        source=Path("../data/plos/plos_documents.parquet"),
     )
 
-    df["year"] = df["publication_date"].apply(lambda x: Timestamp(x).year)
-
-    yearCounts: Series = df["year"].value_counts(ascending=True)
+    yearCounts: DataFrame = analytics.sql(
+        query="""
+        SELECT YEAR(CAST(publication_date AS DATE)) AS year,
+            COUNT(*) AS count
+        FROM plos_documents
+        GROUP BY year
+        ORDER BY year
+        """
+    )
 
-    data: dict[int, float] = computeProportion(vc=yearCounts)
+    data: dict[int, float] = computeProportion(yearCounts=yearCounts)
 
     plot(proportions=data)
 
@@ -4,13 +4,13 @@ from pathlib import Path
 from typing import List
 
 import click
-import pandas
 from pandas import DataFrame
 
 from src.journals._generic import Journal_ABC
 from src.journals.nature import Nature
 from src.journals.plos import PLOS
 from src.journals.science import Science
+from src.search.scheduler import SearchScheduler
 from src.types import SearchResultsDF
 from src.utils import ifFileExistsExit
 
@@ -27,14 +27,19 @@ SEARCH_QUERIES: List[str] = [
 ]
 
 
-def runCollector(journal: Journal_ABC) -> DataFrame:
-    data: List[DataFrame] = []
+def runCollector(
+    journal: Journal_ABC,
+    scheduler: SearchScheduler | None = None,
+) -> DataFrame:
+    if scheduler is None:
+        scheduler = SearchScheduler()
 
-    for pair in product(SEARCH_QUERIES, RELEVANT_YEARS):
-        df: DataFrame = journal.searchJournal(query=pair[0], year=pair[1])
-        data.append(df)
-
-    df: DataFrame = pandas.concat(objs=data, ignore_index=True)
+    df: DataFrame = scheduler.run(
+        units=[
+            (journal, query, year)
+            for query, year in product(SEARCH_QUERIES, RELEVANT_YEARS)
+        ]
+    )
 
     df.drop_duplicates(
         subset=["url"],
@@ -1,16 +1,18 @@
-from json import loads
 from pathlib import Path
-from string import Template
-from typing import List
+from typing import List, Tuple
 
 import click
 import pandas
-import ratelimiter
+import pyarrow
+import pyarrow.parquet as pq
 from pandas import DataFrame, Series
 from progress.bar import Bar
-from requests import Response, get
+from requests import Response
 
-from src.utils import ifFileExistsExit
+from src.openalex import MAX_DOI_BATCH_SIZE
+from src.openalex.client import AsyncOpenAlexClient
+from src.search import TIMEOUT_STATUS_CODE
+from src.utils import ifFileExistsExit, loads
 
 
 def extractDOIs(df: DataFrame, journal: str) -> DataFrame:
@@ -46,8 +48,11 @@ def extractDOIs(df: DataFrame, journal: str) -> DataFrame:
     )
 
 
-def createDOIChunks(df: DataFrame, chunkSize: int = 50) -> List[str]:
-    data: List[str] = []
+def createDOIChunks(
+    df: DataFrame,
+    chunkSize: int = MAX_DOI_BATCH_SIZE,
+) -> List[List[str]]:
+    data: List[List[str]] = []
     dois: Series[str] = df["doi"]
 
     chunks: List[Series[str]] = [
@@ -61,31 +66,52 @@ def createDOIChunks(df: DataFrame, chunkSize: int = 50) -> List[str]:
 
     chunk: Series[str]
     for chunk in chunks:
-        data.append("|".join(chunk))
+        data.append(chunk.to_list())
 
     return data
 
 
-@ratelimiter.RateLimiter(max_calls=10, period=1)
-def queryOA(email: str, doiChunks: List[str]) -> DataFrame:
-    data: dict[str, List] = {"url": [], "status_code": [], "json": []}
-
-    urlTemplate: Template = Template(
-        template="https://api.openalex.org/works?per_page=100&filter=doi:${doi}&mailto="  # noqa: E501
-        + email
-    )
+# Schema of the OpenAlex batch responses written by queryOA
+RESPONSE_SCHEMA: pyarrow.Schema = pyarrow.schema(
+    [
+        ("url", pyarrow.string()),
+        ("status_code", pyarrow.int64()),
+        ("json", pyarrow.binary()),
+    ]
+)
 
-    with Bar("Querying OpenAlex...", max=len(doiChunks)) as bar:
-        dois: str
-        for dois in doiChunks:
-            url: str = urlTemplate.substitute(doi=dois)
-            resp: Response = get(url=url, timeout=60)
-            data["url"].append(url)
-            data["status_code"].append(resp.status_code)
-            data["json"].append(resp.content)
-            bar.next()
 
-    return DataFrame(data=data)
+def queryOA(
+    email: str,
+    doiChunks: List[List[str]],
+    outputFP: Path,
+    concurrency: int = 8,
+) -> None:
+    """
+    Write each batch response to outputFP as its own row group as soon as it
+    arrives, so responses are not held in memory until every batch is done
+    """
+    with pq.ParquetWriter(where=outputFP, schema=RESPONSE_SCHEMA) as writer:
+        with Bar("Querying OpenAlex...", max=len(doiChunks)) as bar:
+
+            def storeBatch(idx: int, url: str, resp: Response | None) -> None:
+                row: Tuple[str, int, bytes] = (
+                    (url, TIMEOUT_STATUS_CODE, b"")
+                    if resp is None
+                    else (url, resp.status_code, resp.content)
+                )
+                writer.write_table(
+                    table=pyarrow.Table.from_pylist(
+                        mapping=[dict(zip(RESPONSE_SCHEMA.names, row))],
+                        schema=RESPONSE_SCHEMA,
+                    )
+                )
+                bar.next()
+
+            AsyncOpenAlexClient(email=email, concurrency=concurrency).run(
+                batches=doiChunks,
+                onBatch=storeBatch,
+            )
 
 
 @click.command()
@@ -144,11 +170,9 @@ def main(email: str, journal: str, inputFP: Path, outputFP: Path) -> None:
 
     doiDF: DataFrame = extractDOIs(df=df, journal=journal)
 
-    doiChunks: List[str] = createDOIChunks(df=doiDF)
-
-    df: DataFrame = queryOA(email=email, doiChunks=doiChunks)
+    doiChunks: List[List[str]] = createDOIChunks(df=doiDF)
 
-    df.to_parquet(path=outputFP, engine="pyarrow")
+    queryOA(email=email, doiChunks=doiChunks, outputFP=outputFP)
 
 
 if __name__ == "__main__":
@@ -1,84 +1,94 @@
-from json import dumps, loads
 from pathlib import Path
-from typing import List
+from typing import Iterable, List
 
 import click
-import pandas
-from pandas import DataFrame, Series
+import pyarrow
+import pyarrow.parquet as pq
 from progress.bar import Bar
 
 from src.filter import FIELD_FILTER
-from src.utils import ifFileExistsExit
+from src.openalex.works import iterWorks
+from src.utils import dumps, ifFileExistsExit
 
 # 1. Only consider documents with at least one citation
 # 2. Only consider documents that have at least two topics that are NS
 
+DOCUMENT_SCHEMA: pyarrow.Schema = pyarrow.schema(
+    [
+        ("doi", pyarrow.string()),
+        ("json", pyarrow.string()),
+        ("citations", pyarrow.int64()),
+        ("field_1", pyarrow.string()),
+        ("field_2", pyarrow.string()),
+        ("field_3", pyarrow.string()),
+        ("ns", pyarrow.bool_()),
+    ]
+)
+
 
-def extractDocuments(df: DataFrame) -> DataFrame:
+def extractDocuments(payloads: Iterable[bytes | str]) -> pyarrow.Table:
+    """
+    Extract the documents of OpenAlex batch responses, parsing one work at a
+    time
+    """
     data: dict[str, List[str | int | bool]] = {
-        "doi": [],
-        "json": [],
-        "citations": [],
-        "field_1": [],
-        "field_2": [],
-        "field_3": [],
-        "ns": [],
+        name: [] for name in DOCUMENT_SCHEMA.names
     }
 
     field_1: str
     field_2: str
     field_3: str
-    row: Series
-    with Bar("Extracting documents...", max=df.shape[0]) as bar:
-        for _, row in df.iterrows():
-            json: dict = loads(s=row["json"])
-
-            result: dict
-            for result in json["results"]:
-                ns: bool = False
-                field_1, field_2, field_3 = ("", "", "")
-
-                doi: str = result["doi"]
-                citations: int = int(result["cited_by_count"])
-
-                fieldCount: int = len(result["topics"])
-
-                if fieldCount > 0:
-                    field_1 = result["topics"][0]["field"]["display_name"]
-
-                if fieldCount > 1:
-                    field_2 = result["topics"][1]["field"]["display_name"]
-
-                if fieldCount > 2:
-                    field_3 = result["topics"][2]["field"]["display_name"]
-
-                if (
-                    len(
-                        FIELD_FILTER.intersection(
-                            [
-                                field_1,
-                                field_2,
-                                field_3,
-                            ]
-                        )
+    payload: bytes | str
+    for payload in payloads:
+        # Timed out batches are stored without a body
+        if not payload:
+            continue
+
+        # Whole works are kept, as every field is written to the json column
+        result: dict
+        for result in iterWorks(payload=payload, fields=None):
+            ns: bool = False
+            field_1, field_2, field_3 = ("", "", "")
+
+            doi: str = result["doi"]
+            citations: int = int(result["cited_by_count"])
+
+            fieldCount: int = len(result["topics"])
+
+            if fieldCount > 0:
+                field_1 = result["topics"][0]["field"]["display_name"]
+
+            if fieldCount > 1:
+                field_2 = result["topics"][1]["field"]["display_name"]
+
+            if fieldCount > 2:
+                field_3 = result["topics"][2]["field"]["display_name"]
+
+            if (
+                len(
+                    FIELD_FILTER.intersection(
+                        [
+                            field_1,
+                            field_2,
+                            field_3,
+                        ]
                     )
-                    > 2
-                ):
-                    ns = True
-
-                jsonStr: str = dumps(obj=result)
+                )
+                > 2
+            ):
+                ns = True
 
-                data["doi"].append(doi)
-                data["json"].append(jsonStr)
-                data["citations"].append(citations)
-                data["field_1"].append(field_1)
-                data["field_2"].append(field_2)
-                data["field_3"].append(field_3)
-                data["ns"].append(ns)
+            jsonStr: str = dumps(obj=result)
 
-            bar.next()
+            data["doi"].append(doi)
+            data["json"].append(jsonStr)
+            data["citations"].append(citations)
+            data["field_1"].append(field_1)
+            data["field_2"].append(field_2)
+            data["field_3"].append(field_3)
+            data["ns"].append(ns)
 
-    return DataFrame(data=data)
+    return pyarrow.Table.from_pydict(mapping=data, schema=DOCUMENT_SCHEMA)
 
 
 # def extractOACitedByCount(df: DataFrame) -> int:
@@ -177,13 +187,45 @@ def extractDocuments(df: DataFrame) -> DataFrame:
         path_type=Path,
     ),
 )
-def main(inputFP: Path, outputFP: Path) -> None:
+@click.option(
+    "-b",
+    "--batch-size",
+    "batchSize",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Number of OpenAlex responses parsed at a time",
+)
+def main(inputFP: Path, outputFP: Path, batchSize: int) -> None:
     ifFileExistsExit(fps=[outputFP])
 
-    df: DataFrame = pandas.read_parquet(path=inputFP, engine="pyarrow")
-
-    docs: DataFrame = extractDocuments(df=df)
-    docs.to_parquet(path=outputFP, engine="pyarrow")
+    # Row groups are read one at a time (queryOA writes one per response) and
+    # split into batches of batchSize responses, so only those responses and
+    # their documents are in memory at a time
+    parquetFile: pq.ParquetFile = pq.ParquetFile(
+        source=inputFP,
+        pre_buffer=False,
+    )
+
+    with pq.ParquetWriter(where=outputFP, schema=DOCUMENT_SCHEMA) as writer:
+        with Bar(
+            "Extracting documents...",
+            max=parquetFile.metadata.num_rows,
+        ) as bar:
+            rowGroup: int
+            for rowGroup in range(parquetFile.num_row_groups):
+                batch: pyarrow.RecordBatch
+                for batch in parquetFile.iter_batches(
+                    batch_size=batchSize,
+                    row_groups=[rowGroup],
+                    columns=["json"],
+                ):
+                    writer.write_table(
+                        table=extractDocuments(
+                            payloads=batch.column("json").to_pylist()
+                        )
+                    )
+                    bar.next(n=batch.num_rows)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+from pathlib import Path
+from typing import Any, List
+
+import duckdb
+from pandas import DataFrame
+
+# Views over the aius schema with the dimension ids of search_responses
+# resolved to their natural keys, as in the datasets written by aius export
+SQLITE_VIEWS: dict[str, str] = {
+    "search_responses": """
+        SELECT search_responses.id, journals.journal, keywords.keyword,
+            years.year, search_responses.url, search_responses.page,
+            search_responses.status_code, search_responses.payload_sha256,
+            search_responses.payload_length
+        FROM aius.search_responses AS search_responses
+        JOIN aius.journals AS journals
+            ON journals.id = search_responses.journal
+        JOIN aius.keywords AS keywords
+            ON keywords.id = search_responses.keyword
+        JOIN aius.years AS years ON years.id = search_responses.year
+    """,
+    "search_results": "SELECT * FROM aius.search_results",
+    "documents": "SELECT * FROM aius.documents",
+    "works": "SELECT * FROM aius.works",
+    "work_topics": "SELECT * FROM aius.work_topics",
+}
+
+
+# SET, ATTACH and CREATE VIEW are DDL that DuckDB cannot bind parameters
+# into, so values are spliced in through these quoting helpers instead
+def _literal(value: str | Path) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _identifier(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+class Analytics:
+    """
+    Embedded DuckDB session for reports over the AIUS database.
+
+    The SQLite database is attached read-only and/or a directory written by
+    aius export is mapped to the same views (search_responses,
+    search_results, documents, works, work_topics), so the aggregates below
+    run as vectorized SQL without loading whole tables into pandas. Other
+    parquet or CSV outputs and DataFrames can be registered as extra views.
+    """
+
+    def __init__(
+        self,
+        db: Path | None = None,
+        dataset: Path | None = None,
+        memoryLimit: str = "2GB",
+    ) -> None:
+        self.conn: duckdb.DuckDBPyConnection = duckdb.connect()
+        self.conn.execute(f"SET memory_limit = {_literal(memoryLimit)}")
+
+        name: str
+        sql: str
+        if db is not None:
+            self.conn.execute(
+                f"ATTACH {_literal(db)} AS aius (TYPE sqlite, READ_ONLY)"
+            )
+            for name, sql in SQLITE_VIEWS.items():
+                self.conn.execute(f"CREATE OR REPLACE VIEW {name} AS {sql}")
+
+        if dataset is not None:
+            for name in SQLITE_VIEWS:
+                if (dataset / name).exists():
+                    self.register(name=name, source=dataset / name)
+
+    def register(self, name: str, source: Path | DataFrame) -> None:
+        """
+        Expose a parquet file, Hive partitioned parquet directory, CSV file,
+        or DataFrame as the view name
+        """
+        if isinstance(source, DataFrame):
+            self.conn.register(view_name=name, python_object=source)
+            return None
+
+        reader: str
+        if source.is_dir():
+            reader = (
+                f"read_parquet({_literal(source / '**' / '*.parquet')}, "
+                "hive_partitioning = true)"
+            )
+        elif source.suffix == ".csv":
+            reader = f"read_csv_auto({_literal(source)})"
+        else:
+            reader = f"read_parquet({_literal(source)})"
+
+        self.conn.execute(
+            f"CREATE OR REPLACE VIEW {_identifier(name)} "  # nosec B608
+            f"AS SELECT * FROM {reader}"
+        )
+
+    def sql(self, query: str, params: List[Any] | None = None) -> DataFrame:
+        return self.conn.execute(query, params).df()
+
+    def documentsPerYear(self) -> DataFrame:
+        """
+        Distinct documents found per search year
+        """
+        return self.sql(
+            query="""
+            SELECT search_responses.year,
+                COUNT(DISTINCT search_results.document_id) AS documents
+            FROM search_results
+            JOIN search_responses
+                ON search_responses.id = search_results.response_id
+            GROUP BY ALL
+            ORDER BY ALL
+            """
+        )
+
+    def documentsPerKeyword(self) -> DataFrame:
+        """
+        Distinct documents found per search keyword
+        """
+        return self.sql(
+            query="""
+            SELECT search_responses.keyword,
+                COUNT(DISTINCT search_results.document_id) AS documents
+            FROM search_results
+            JOIN search_responses
+                ON search_responses.id = search_results.response_id
+            GROUP BY ALL
+            ORDER BY ALL
+            """
+        )
+
+    def documentsPerYearPerKeyword(self) -> DataFrame:
+        """
+        Distinct documents found per search year (rows) and keyword (columns)
+        """
+        return self.sql(
+            query="""
+            PIVOT (
+                SELECT search_responses.year, search_responses.keyword,
+                    search_results.document_id
+                FROM search_results
+                JOIN search_responses
+                    ON search_responses.id = search_results.response_id
+            )
+            ON keyword
+            USING COUNT(DISTINCT document_id)
+            GROUP BY year
+            ORDER BY year
+            """
+        )
+
+    def worksPerField(self, topN: int = 3) -> DataFrame:
+        """
+        Distinct works with a field among their top topN topics
+        """
+        return self.sql(
+            query="""
+            SELECT field, COUNT(DISTINCT document_id) AS works
+            FROM work_topics
+            WHERE rank < ?
+            GROUP BY ALL
+            ORDER BY works DESC
+            """,
+            params=[topN],
+        )
+
+    def topicLevelCounts(self) -> DataFrame:
+        """
+        Number of distinct topics, subfields, fields, and domains assigned
+        """
+        return self.sql(
+            query="""
+            SELECT COUNT(DISTINCT topic) AS topics,
+                COUNT(DISTINCT subfield) AS subfields,
+                COUNT(DISTINCT field) AS fields,
+                COUNT(DISTINCT domain) AS domains
+            FROM work_topics
+            """
+        )
@@ -0,0 +1,108 @@
+import gzip
+import mmap
+import os
+from hashlib import sha256
+from pathlib import Path
+from typing import Tuple
+from uuid import uuid4
+
+import zstandard
+
+# Raw html/JSON payloads are stored compressed; the codec of a blob is read
+# from its magic number so zstd and gzip blobs can coexist in one store
+PAYLOAD_CODEC: str = "zstd"
+
+MAGIC_NUMBERS: dict[bytes, str] = {
+    b"\x28\xb5\x2f\xfd": "zstd",
+    b"\x1f\x8b": "gzip",
+}
+
+
+def compressPayload(
+    payload: str | bytes,
+    codec: str = PAYLOAD_CODEC,
+) -> bytes:
+    if isinstance(payload, str):
+        payload = payload.encode()
+
+    match codec:
+        case "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(payload)
+        case "gzip":
+            return gzip.compress(data=payload, compresslevel=6)
+        case _:
+            raise ValueError(f"Unsupported payload codec: {codec}")
+
+
+def decompressPayload(blob: bytes | mmap.mmap, codec: str) -> str:
+    match codec:
+        case "zstd":
+            payload: bytes = zstandard.ZstdDecompressor().decompress(blob)
+        case "gzip":
+            payload = gzip.decompress(data=blob)
+        case _:
+            raise ValueError(f"Unsupported payload codec: {codec}")
+
+    return payload.decode(errors="ignore")
+
+
+def detectCodec(blob: bytes | mmap.mmap) -> str:
+    magic: bytes
+    codec: str
+    for magic, codec in MAGIC_NUMBERS.items():
+        if blob[: len(magic)] == magic:
+            return codec
+
+    raise ValueError("Unknown payload codec")
+
+
+class BlobStore:
+    """
+    Content-addressed store of compressed payloads on local disk.
+
+    Blobs are keyed by the SHA-256 of their uncompressed bytes and sharded as
+    <directory>/ab/cd/<digest>, so identical responses are stored once and no
+    directory grows too large. Blobs are written to a temporary file and
+    renamed into place, so concurrent writers never expose partial blobs.
+    """
+
+    def __init__(self, directory: Path, codec: str = PAYLOAD_CODEC) -> None:
+        self.directory: Path = directory
+        self.codec: str = codec
+
+    def path(self, digest: str) -> Path:
+        return self.directory / digest[0:2] / digest[2:4] / digest
+
+    def put(self, payload: str | bytes) -> Tuple[str, int]:
+        """
+        Store payload, returning its SHA-256 digest and uncompressed length
+        """
+        if isinstance(payload, str):
+            payload = payload.encode()
+
+        digest: str = sha256(payload).hexdigest()
+        fp: Path = self.path(digest=digest)
+
+        if not fp.exists():
+            fp.parent.mkdir(parents=True, exist_ok=True)
+
+            tmp: Path = fp.with_name(f"{digest}.{uuid4().hex}.tmp")
+            tmp.write_bytes(compressPayload(payload=payload, codec=self.codec))
+            os.replace(src=tmp, dst=fp)
+
+        return (digest, len(payload))
+
+    def get(self, digest: str) -> str:
+        """
+        Memory-map and decompress a blob
+        """
+        with open(file=self.path(digest=digest), mode="rb") as blobFile:
+            with mmap.mmap(
+                fileno=blobFile.fileno(),
+                length=0,
+                access=mmap.ACCESS_READ,
+            ) as blob:
+                return decompressPayload(blob=blob, codec=detectCodec(blob))
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest=digest).exists()
@@ -0,0 +1,263 @@
+from pathlib import Path
+from typing import Iterator, List
+
+import pandas
+import pyarrow
+import pyarrow.dataset as ds
+from pandas import DataFrame
+from progress.bar import Bar
+from sqlalchemy import Select, Table, select
+
+from src.db import DB, DIMENSIONS
+
+# Dimension tables are written by aius init and are joined into the exported
+# tables as natural keys instead
+DIMENSION_TABLES: set[str] = {
+    table for table, _ in DIMENSIONS.values() if table != "documents"
+}
+
+# search_responses columns that reference a dimension table
+DIMENSION_COLUMNS: set[str] = {"journal", "keyword", "year"}
+
+# Exported tables that are Hive partitioned as journal=<name>/year=<year>
+PARTITION_COLUMNS: List[str] = ["journal", "year"]
+PARTITIONED_TABLES: set[str] = {"search_responses", "search_results"}
+
+# Low cardinality string columns stored as Arrow dictionaries
+DICTIONARY_COLUMNS: set[str] = {
+    "journal",
+    "keyword",
+    "subfield",
+    "field",
+    "domain",
+}
+
+ARROW_TYPES: dict[type, pyarrow.DataType] = {
+    int: pyarrow.int64(),
+    float: pyarrow.float64(),
+    str: pyarrow.string(),
+    bytes: pyarrow.binary(),
+}
+
+# Rows per Parquet row group; payloads stay in the blob store, so tables only
+# hold small metadata columns
+ROW_GROUP_SIZE: int = 128 * 1024
+ROWS_PER_FILE: int = 1024 * 1024
+
+
+def _exportStatement(db: DB, table: str) -> Select:
+    """
+    Select the rows of table with the journal and year of partitioned tables
+    resolved to their natural keys
+    """
+    tableObj: Table = db.metadata.tables[table]
+    responses: Table = db.metadata.tables["search_responses"]
+    journals: Table = db.metadata.tables["journals"]
+    keywords: Table = db.metadata.tables["keywords"]
+    years: Table = db.metadata.tables["years"]
+
+    match table:
+        case "search_responses":
+            return select(
+                *[
+                    column
+                    for column in responses.c
+                    if column.name not in DIMENSION_COLUMNS
+                ],
+                keywords.c.keyword,
+                journals.c.journal,
+                years.c.year,
+            ).select_from(
+                responses.join(
+                    keywords,
+                    keywords.c.id == responses.c.keyword,
+                )
+                .join(journals, journals.c.id == responses.c.journal)
+                .join(years, years.c.id == responses.c.year)
+            )
+        case "search_results":
+            return select(
+                tableObj,
+                journals.c.journal,
+                years.c.year,
+            ).select_from(
+                tableObj.join(
+                    responses,
+                    responses.c.id == tableObj.c.response_id,
+                )
+                .join(journals, journals.c.id == responses.c.journal)
+                .join(years, years.c.id == responses.c.year)
+            )
+        case _:
+            return select(tableObj)
+
+
+def _arrowSchema(statement: Select) -> pyarrow.Schema:
+    return pyarrow.schema(
+        [
+            (
+                column.name,
+                (
+                    pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+                    if column.name in DICTIONARY_COLUMNS
+                    else ARROW_TYPES[column.type.python_type]
+                ),
+            )
+            for column in statement.selected_columns
+        ]
+    )
+
+
+def _iterBatches(
+    db: DB,
+    statement: Select,
+    schema: pyarrow.Schema,
+    chunksize: int,
+) -> Iterator[pyarrow.RecordBatch]:
+    with db.engine.connect() as conn:
+        df: DataFrame
+        for df in pandas.read_sql_query(
+            sql=statement,
+            con=conn.execution_options(stream_results=True),
+            chunksize=chunksize,
+        ):
+            yield from pyarrow.Table.from_pandas(
+                df=df,
+                schema=schema,
+                preserve_index=False,
+            ).to_batches()
+
+
+def exportTable(
+    db: DB,
+    table: str,
+    directory: Path,
+    rowGroupSize: int = ROW_GROUP_SIZE,
+) -> None:
+    """
+    Write table to directory/table as a Parquet dataset, Hive partitioned by
+    journal and year where the table has them
+    """
+    statement: Select = _exportStatement(db=db, table=table)
+    schema: pyarrow.Schema = _arrowSchema(statement=statement)
+
+    partitioning: ds.Partitioning | None = None
+    if table in PARTITIONED_TABLES:
+        partitioning = ds.partitioning(
+            schema=pyarrow.schema(
+                [schema.field(name) for name in PARTITION_COLUMNS]
+            ),
+            flavor="hive",
+        )
+
+    ds.write_dataset(
+        data=_iterBatches(
+            db=db,
+            statement=statement,
+            schema=schema,
+            chunksize=rowGroupSize,
+        ),
+        base_dir=directory / table,
+        schema=schema,
+        format="parquet",
+        partitioning=partitioning,
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression="zstd",
+        ),
+        min_rows_per_group=rowGroupSize,
+        max_rows_per_group=rowGroupSize,
+        max_rows_per_file=max(ROWS_PER_FILE, rowGroupSize),
+        existing_data_behavior="delete_matching",
+    )
+
+
+def exportDB(
+    db: DB,
+    directory: Path,
+    rowGroupSize: int = ROW_GROUP_SIZE,
+) -> None:
+    tables: List[str] = [
+        table.name
+        for table in db.metadata.sorted_tables
+        if table.name not in DIMENSION_TABLES
+    ]
+
+    table: str
+    with Bar("Exporting tables...", max=len(tables)) as bar:
+        for table in tables:
+            exportTable(
+                db=db,
+                table=table,
+                directory=directory,
+                rowGroupSize=rowGroupSize,
+            )
+            bar.next()
+
+
+def readDataset(
+    directory: Path,
+    table: str,
+    columns: List[str] | None = None,
+    filter: ds.Expression | None = None,
+) -> pyarrow.Table:
+    """
+    Read only the requested columns and partitions of an exported table, e.g.
+    filter=ds.field("journal") == "PLOS"
+    """
+    return ds.dataset(
+        source=directory / table,
+        format="parquet",
+        partitioning="hive" if table in PARTITIONED_TABLES else None,
+    ).to_table(columns=columns, filter=filter)
+
+
+def importTable(db: DB, table: str, directory: Path) -> None:
+    """
+    Append an exported table to the database, mapping natural keys back to
+    the ids of the dimension tables
+    """
+    if not (directory / table).exists():
+        return None
+
+    dataset: ds.Dataset = ds.dataset(
+        source=directory / table,
+        format="parquet",
+        partitioning="hive" if table in PARTITIONED_TABLES else None,
+    )
+
+    batch: pyarrow.RecordBatch
+    for batch in dataset.to_batches(batch_size=ROW_GROUP_SIZE):
+        df: DataFrame = batch.to_pandas()
+
+        # Dictionary columns are read back as categoricals
+        df = df.astype(
+            dtype={
+                column: object
+                for column in df.select_dtypes(include="category").columns
+            }
+        )
+
+        match table:
+            case "search_responses":
+                db.resolveKeys(
+                    df=df,
+                    columns={column: column for column in DIMENSION_COLUMNS},
+                )
+            case "search_results":
+                df = df.drop(columns=PARTITION_COLUMNS)
+
+        db.bulkInsert(table=table, data=df)
+
+
+def importDB(db: DB, directory: Path) -> None:
+    tables: List[str] = [
+        table.name
+        for table in db.metadata.sorted_tables
+        if table.name not in DIMENSION_TABLES
+    ]
+
+    table: str
+    with Bar("Importing tables...", max=len(tables)) as bar:
+        for table in tables:
+            importTable(db=db, table=table, directory=directory)
+            bar.next()
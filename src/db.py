@@ -1,29 +1,160 @@
+import sqlite3
+from collections import defaultdict
 from os.path import abspath
 from pathlib import Path
+from typing import Any, Iterator, List, Tuple
 
 import pandas
-from pandas import DataFrame
+from pandas import DataFrame, Series
 from sqlalchemy import (
     Column,
     Engine,
+    Float,
     ForeignKey,
+    Index,
+    Insert,
     Integer,
     MetaData,
+    Select,
     String,
     Table,
+    Update,
+    bindparam,
     create_engine,
+    event,
+    exists,
+    func,
+    inspect,
+    select,
+    update,
 )
+from sqlalchemy.engine import Compiled, Connection
+from sqlalchemy.sql.elements import ColumnElement
 
 from src import JOURNALS, SEARCH_KEYWORDS, YEARS
+from src.blobstore import BlobStore, decompressPayload
+
+# Applied to every connection: WAL lets readers run alongside the crawl's
+# writer, and the larger page cache, in-memory temp store and mmap keep
+# large scans and bulk inserts off the disk
+SQLITE_PRAGMAS: List[str] = [
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "cache_size=-262144",
+    "temp_store=MEMORY",
+    "mmap_size=1073741824",
+]
+
+
+# Representative lookups and reporting joins checked by DB.analyze
+REPORT_QUERIES: dict[str, str] = {
+    "responses_by_search": """
+        SELECT id, page, status_code FROM search_responses
+        WHERE journal = 1 AND keyword = 1 AND year = 1
+    """,
+    "results_by_response": """
+        SELECT document_id FROM search_results WHERE response_id = 1
+    """,
+    "results_by_document": """
+        SELECT response_id FROM search_results WHERE document_id = 1
+    """,
+    "openalex_by_document": """
+        SELECT id, status_code FROM openalex_responses WHERE document_id = 1
+    """,
+    "works_by_field": """
+        SELECT document_id FROM work_topics
+        WHERE field = 'Neuroscience' AND rank < 3
+    """,
+    "works_by_year": """
+        SELECT document_id FROM works WHERE publication_year = 2020
+    """,
+    "documents_search_works": """
+        SELECT documents.doi, search_responses.journal,
+            search_responses.keyword, search_responses.year,
+            works.cited_by_count
+        FROM search_results
+        JOIN documents ON documents.id = search_results.document_id
+        JOIN search_responses
+            ON search_responses.id = search_results.response_id
+        JOIN works ON works.document_id = documents.id
+    """,
+}
+
+# Natural key -> (dimension table, natural key column); ids are the table's
+# primary key
+DIMENSIONS: dict[str, Tuple[str, str]] = {
+    "year": ("years", "year"),
+    "keyword": ("keywords", "keyword"),
+    "journal": ("journals", "journal"),
+    "doi": ("documents", "doi"),
+}
+
+
+def mapKeys(values: Series, keyMap: Series) -> Tuple[Series, List[Any]]:
+    """
+    Hash join values against keyMap (natural key -> id), returning the ids
+    and the distinct values that had no match
+    """
+    ids: Series = values.map(arg=keyMap)
+    unmatched: List[Any] = values[ids.isna()].unique().tolist()
+    return (ids, unmatched)
+
+
+def _applySQLitePragmas(
+    dbapiConnection: sqlite3.Connection,
+    connectionRecord: Any,
+) -> None:
+    cursor: sqlite3.Cursor = dbapiConnection.cursor()
+
+    # PRAGMA statements cannot take bound parameters; the pragmas are the
+    # SQLITE_PRAGMAS constants above
+    pragma: str
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")  # nosec B608
+
+    cursor.close()
+
+
+def readLegacyPayload(blob: bytes | str | None, codec: str | None) -> str:
+    """
+    Return a pre blob store html payload as text; rows without a codec were
+    stored uncompressed
+    """
+    if blob is None:
+        return ""
+
+    if codec is None:
+        return (
+            blob.decode(errors="ignore") if isinstance(blob, bytes) else blob
+        )
+
+    return decompressPayload(blob=blob, codec=codec)
 
 
 class DB:
-    def __init__(self, fp: Path) -> None:
+    """
+    The AIUS SQLite3 database.
+
+    Raw html/JSON payloads are kept out of SQLite in a content-addressed
+    BlobStore (by default <fp stem>.blobs next to the database); payload
+    tables only store the SHA-256 digest and length of each payload.
+    """
+
+    def __init__(self, fp: Path, blobDirectory: Path | None = None) -> None:
         self.fp: Path = Path(abspath(path=fp))
+        self.blobs: BlobStore = BlobStore(
+            directory=(
+                blobDirectory
+                if blobDirectory is not None
+                else self.fp.with_suffix(".blobs")
+            )
+        )
         self.engine: Engine = create_engine(url=f"sqlite:///{self.fp}")
+        event.listen(self.engine, "connect", _applySQLitePragmas)
         self.metadata: MetaData = MetaData()
+        self._defineTables()
 
-    def createTables(self) -> None:
+    def _defineTables(self) -> None:
         _: Table = Table(
             "years",
             self.metadata,
@@ -90,7 +221,8 @@ class DB:
             Column("url", String, nullable=False),
             Column("page", Integer, nullable=False),
             Column("status_code", Integer, nullable=False),
-            Column("html", String, nullable=False),
+            Column("payload_sha256", String, nullable=False),
+            Column("payload_length", Integer, nullable=False),
         )
 
         _: Table = Table(
@@ -105,31 +237,683 @@ class DB:
             ),
             Column("url", String, nullable=False),
             Column("status_code", Integer, nullable=False),
-            Column("html", String, nullable=False),
+            Column("payload_sha256", String, nullable=False),
+            Column("payload_length", Integer, nullable=False),
         )
 
+        # Typed OpenAlex metadata read by the Analytics reports. The file
+        # based filter and sample stages (2_filterDocs, filterDocuments,
+        # sampleDocuments) still read OpenAlex JSON, as their outputs carry
+        # the full work records that these tables do not keep
+        _: Table = Table(
+            "works",
+            self.metadata,
+            Column(
+                "document_id",
+                Integer,
+                ForeignKey("documents.id"),
+                primary_key=True,
+            ),
+            Column("openalex_id", String),
+            Column("cited_by_count", Integer),
+            Column("publication_date", String),
+            Column("publication_year", Integer),
+        )
+
+        _: Table = Table(
+            "work_topics",
+            self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column(
+                "document_id",
+                Integer,
+                ForeignKey("works.document_id"),
+                nullable=False,
+            ),
+            Column("rank", Integer, nullable=False),
+            Column("topic_id", String),
+            Column("topic", String),
+            Column("score", Float),
+            Column("subfield", String),
+            Column("field", String),
+            Column("domain", String),
+        )
+
+        _: Table = Table(
+            "watermarks",
+            self.metadata,
+            Column("stage", String, primary_key=True),
+            Column("value", Integer, nullable=False),
+        )
+
+        _: Index = Index(
+            "ix_search_results_document_id",
+            self.metadata.tables["search_results"].c.document_id,
+        )
+        _: Index = Index(
+            "ix_search_results_response_id",
+            self.metadata.tables["search_results"].c.response_id,
+        )
+        _: Index = Index(
+            "ix_openalex_responses_document_id",
+            self.metadata.tables["openalex_responses"].c.document_id,
+        )
+        _: Index = Index(
+            "ix_search_responses_journal_keyword_year",
+            self.metadata.tables["search_responses"].c.journal,
+            self.metadata.tables["search_responses"].c.keyword,
+            self.metadata.tables["search_responses"].c.year,
+        )
+        _: Index = Index(
+            "ix_works_publication_year",
+            self.metadata.tables["works"].c.publication_year,
+        )
+        _: Index = Index(
+            "ix_work_topics_document_id",
+            self.metadata.tables["work_topics"].c.document_id,
+        )
+        _: Index = Index(
+            "ix_work_topics_field_rank",
+            self.metadata.tables["work_topics"].c.field,
+            self.metadata.tables["work_topics"].c.rank,
+            self.metadata.tables["work_topics"].c.document_id,
+        )
+
+    def createTables(self) -> None:
         self.metadata.create_all(bind=self.engine, checkfirst=True)
 
+    def createIndexes(self) -> None:
+        """
+        Create any declared index missing from an existing database
+        """
+        table: Table
+        for table in self.metadata.sorted_tables:
+            index: Index
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+
+    def analyze(self) -> DataFrame:
+        """
+        Refresh the query planner statistics and return the plan of every
+        REPORT_QUERIES entry, flagging steps that scan a whole table
+        """
+        data: defaultdict[str, List[str | bool]] = defaultdict(list)
+
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+
+            # EXPLAIN wraps whole statements, which cannot be bound; the
+            # statements are the REPORT_QUERIES constants above
+            name: str
+            sql: str
+            for name, sql in REPORT_QUERIES.items():
+                explain: str = f"EXPLAIN QUERY PLAN {sql}"  # nosec B608
+
+                row: Tuple
+                for row in conn.exec_driver_sql(explain):
+                    detail: str = row[-1]
+                    data["query"].append(name)
+                    data["detail"].append(detail)
+                    data["full_scan"].append(
+                        detail.startswith("SCAN") and "INDEX" not in detail
+                    )
+
+        return DataFrame(data=data)
+
     def writeConstants(self) -> None:
-        YEARS.to_sql(
-            name="years",
-            con=self.engine,
-            index=False,
+        self.bulkInsert(table="years", data=YEARS)
+        self.bulkInsert(table="keywords", data=SEARCH_KEYWORDS)
+        self.bulkInsert(table="journals", data=JOURNALS)
+
+    def bulkInsert(
+        self,
+        table: str,
+        data: DataFrame,
+        batchSize: int = 50000,
+        orIgnore: bool = False,
+    ) -> None:
+        """
+        Insert the rows of data with DB-API executemany batches of batchSize
+        inside a single transaction. With orIgnore, rows that violate a
+        UNIQUE constraint are skipped instead of failing the transaction.
+        """
+        with self.engine.begin() as conn:
+            self._insertRows(
+                conn=conn,
+                table=table,
+                data=data,
+                batchSize=batchSize,
+                orIgnore=orIgnore,
+            )
+
+    def _insertRows(
+        self,
+        conn: Connection,
+        table: str,
+        data: DataFrame,
+        batchSize: int,
+        orIgnore: bool = False,
+    ) -> None:
+        if data.shape[0] == 0:
+            return None
+
+        insert: Insert = self.metadata.tables[table].insert()
+        if orIgnore:
+            insert = insert.prefix_with("OR IGNORE")
+
+        statement: Compiled = insert.compile(
+            dialect=self.engine.dialect,
+            column_keys=data.columns.to_list(),
         )
-        SEARCH_KEYWORDS.to_sql(
-            name="keywords",
-            con=self.engine,
-            index=False,
+
+        # Columns are ordered to match the compiled positional parameters,
+        # and object dtype yields native Python values that sqlite3 can bind
+        data = data[list(statement.positiontup)]
+        rows: List[Tuple] = list(
+            data.astype(dtype=object)
+            .where(cond=data.notna(), other=None)
+            .itertuples(index=False, name=None)
         )
-        JOURNALS.to_sql(
-            name="journals",
+
+        idx: int
+        for idx in range(0, len(rows), batchSize):
+            conn.exec_driver_sql(
+                str(statement),
+                rows[idx : idx + batchSize],  # noqa: E203
+            )
+
+    def writeWorks(self, works: DataFrame, topics: DataFrame) -> None:
+        """
+        Replace the works and work_topics rows of the documents in works in a
+        single transaction, so refetched works do not duplicate topics
+        """
+        if works.shape[0] == 0:
+            return None
+
+        worksTable: Table = self.metadata.tables["works"]
+        topicsTable: Table = self.metadata.tables["work_topics"]
+        documentIDs: List[int] = works["document_id"].astype(int).to_list()
+
+        with self.engine.begin() as conn:
+            idx: int
+            for idx in range(0, len(documentIDs), 500):
+                batch: List[int] = documentIDs[idx : idx + 500]  # noqa: E203
+                conn.execute(
+                    topicsTable.delete().where(
+                        topicsTable.c.document_id.in_(batch)
+                    )
+                )
+                conn.execute(
+                    worksTable.delete().where(
+                        worksTable.c.document_id.in_(batch)
+                    )
+                )
+
+            self._insertRows(
+                conn=conn,
+                table="works",
+                data=works,
+                batchSize=50000,
+            )
+            self._insertRows(
+                conn=conn,
+                table="work_topics",
+                data=topics,
+                batchSize=50000,
+            )
+
+    def _lookupIDs(
+        self,
+        conn: Connection,
+        dimension: str,
+        values: List[Any],
+        batchSize: int = 500,
+    ) -> Series:
+        """
+        Map only the given natural keys of a dimension to their ids
+        """
+        table, column = DIMENSIONS[dimension]
+        tableObj: Table = self.metadata.tables[table]
+
+        dfs: List[DataFrame] = []
+
+        idx: int
+        for idx in range(0, len(values), batchSize):
+            dfs.append(
+                pandas.read_sql_query(
+                    sql=select(tableObj.c.id, tableObj.c[column]).where(
+                        tableObj.c[column].in_(
+                            values[idx : idx + batchSize]  # noqa: E203
+                        )
+                    ),
+                    con=conn,
+                )
+            )
+
+        df: DataFrame = pandas.concat(objs=dfs, ignore_index=True)
+        return Series(data=df["id"].to_numpy(), index=df[column])
+
+    def _insertSearchResults(self, conn: Connection, data: DataFrame) -> None:
+        """
+        Insert the DOIs of data (document_id, response_id) into documents,
+        skipping existing ones, and append the search results with their
+        resolved document ids
+        """
+        dois: List[str] = data["document_id"].unique().tolist()
+
+        if len(dois) == 0:
+            return None
+
+        self._insertRows(
+            conn=conn,
+            table="documents",
+            data=DataFrame(data={"doi": dois}),
+            batchSize=50000,
+            orIgnore=True,
+        )
+
+        data = data.copy()
+        data["document_id"] = data["document_id"].map(
+            arg=self._lookupIDs(conn=conn, dimension="doi", values=dois)
+        )
+
+        self._insertRows(
+            conn=conn,
+            table="search_results",
+            data=data,
+            batchSize=50000,
+        )
+
+    def writeSearchResults(
+        self,
+        data: DataFrame,
+        stage: str,
+        watermark: int,
+    ) -> None:
+        """
+        In one transaction, insert the search results of data (document_id,
+        response_id) and advance the stage's watermark. A failed run
+        therefore leaves no partial results behind.
+        """
+        with self.engine.begin() as conn:
+            self._insertSearchResults(conn=conn, data=data)
+            self._writeWatermark(conn=conn, stage=stage, value=watermark)
+
+    def writeSearchResponse(
+        self,
+        response: dict[str, Any],
+        dois: List[str],
+    ) -> int:
+        """
+        In one transaction, insert a search_responses row and the search
+        results of the DOIs found on it, returning the new response id
+        """
+        with self.engine.begin() as conn:
+            responseID: int = conn.execute(
+                self.metadata.tables["search_responses"].insert(),
+                response,
+            ).inserted_primary_key[0]
+
+            self._insertSearchResults(
+                conn=conn,
+                data=DataFrame(
+                    data={"document_id": list(dict.fromkeys(dois))},
+                ).assign(response_id=responseID),
+            )
+
+        return responseID
+
+    def readWatermark(self, stage: str) -> int | None:
+        """
+        Return the last row id processed by stage, or None if it never ran
+        """
+        watermarks: Table = self.metadata.tables["watermarks"]
+
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(watermarks.c.value).where(watermarks.c.stage == stage)
+            ).scalar_one_or_none()
+
+    def _writeWatermark(
+        self,
+        conn: Connection,
+        stage: str,
+        value: int,
+    ) -> None:
+        conn.execute(
+            self.metadata.tables["watermarks"]
+            .insert()
+            .prefix_with("OR REPLACE"),
+            {"stage": stage, "value": value},
+        )
+
+    def maxValue(self, table: str, column: str = "id") -> int:
+        """
+        Return the largest value of an integer column, or 0 if table is empty
+        """
+        tableObj: Table = self.table(name=table)
+
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(func.coalesce(func.max(tableObj.c[column]), 0))
+            ).scalar_one()
+
+    def keyMap(self, dimension: str) -> Series:
+        """
+        Return a Series mapping the natural keys of a dimension to their ids
+        """
+        table, column = DIMENSIONS[dimension]
+        tableObj: Table = self.metadata.tables[table]
+
+        df: DataFrame = pandas.read_sql_query(
+            sql=select(tableObj.c.id, tableObj.c[column]),
             con=self.engine,
-            index=False,
         )
 
-    def readTableToDF(self, table: str) -> DataFrame:
-        return pandas.read_sql_table(
-            table_name=table,
+        keyMap: Series = Series(data=df["id"].to_numpy(), index=df[column])
+
+        # pandas builds the index hash table lazily, which is not thread
+        # safe. Checking uniqueness builds it now, before the key map is
+        # shared by the search workers, and a natural key with two ids could
+        # not be resolved anyway
+        if not keyMap.index.is_unique:
+            raise ValueError(f"{table}.{column} has duplicate natural keys")
+
+        return keyMap
+
+    def resolveKeys(
+        self,
+        df: DataFrame,
+        columns: dict[str, str],
+        keyMaps: dict[str, Series] = {},
+    ) -> dict[str, List[Any]]:
+        """
+        Replace the natural keys in df (column -> dimension) with their ids in
+        place. keyMaps may provide preloaded dimension maps; missing ones are
+        read from the database. Unmatched keys are reported, left as NA, and
+        returned per column.
+        """
+        data: dict[str, List[Any]] = {}
+
+        column: str
+        dimension: str
+        for column, dimension in columns.items():
+            keyMap: Series = (
+                keyMaps[dimension]
+                if dimension in keyMaps
+                else self.keyMap(dimension=dimension)
+            )
+
+            ids: Series
+            ids, data[column] = mapKeys(values=df[column], keyMap=keyMap)
+            df[column] = ids.astype(dtype="Int64")
+
+            if len(data[column]) > 0:
+                print(
+                    f"{len(data[column])} {column} values have no {dimension}"
+                    f" id, e.g. {data[column][:5]}"
+                )
+
+        return data
+
+    def readCompletedSearchPages(self) -> dict[Tuple[str, str, int], set[int]]:
+        """
+        Map (journal, keyword, year) to the pages stored with a 200 status
+        """
+        data: defaultdict[Tuple[str, str, int], set[int]] = defaultdict(set)
+
+        df: DataFrame = pandas.read_sql_query(
+            sql="""
+            SELECT journals.journal, keywords.keyword, years.year,
+                search_responses.page
+            FROM search_responses
+            JOIN journals ON journals.id = search_responses.journal
+            JOIN keywords ON keywords.id = search_responses.keyword
+            JOIN years ON years.id = search_responses.year
+            WHERE search_responses.status_code = 200
+            """,
             con=self.engine,
-            index_col="id",
         )
+
+        journal: str
+        keyword: str
+        year: int
+        page: int
+        for journal, keyword, year, page in df.itertuples(index=False):
+            data[(journal, keyword, year)].add(page)
+
+        return dict(data)
+
+    def readFailedOpenAlexDOIs(self) -> List[str]:
+        """
+        DOIs of the documents whose OpenAlex batch failed and that still have
+        no works row
+        """
+        documents: Table = self.metadata.tables["documents"]
+        responses: Table = self.metadata.tables["openalex_responses"]
+        works: Table = self.metadata.tables["works"]
+
+        with self.engine.connect() as conn:
+            return list(
+                conn.execute(
+                    select(documents.c.doi)
+                    .distinct()
+                    .join(responses, responses.c.document_id == documents.c.id)
+                    .where(responses.c.status_code != 200)
+                    .where(
+                        ~exists().where(works.c.document_id == documents.c.id)
+                    )
+                ).scalars()
+            )
+
+    def table(self, name: str) -> Table:
+        if name not in self.metadata.tables:
+            return Table(name, MetaData(), autoload_with=self.engine)
+
+        return self.metadata.tables[name]
+
+    def readTableToDF(
+        self,
+        table: str,
+        columns: List[str] | None = None,
+        where: ColumnElement[bool] | None = None,
+        chunksize: int | None = None,
+        loadPayloads: bool = True,
+    ) -> DataFrame | Iterator[DataFrame]:
+        """
+        Read a table indexed by id.
+
+        columns limits the columns read (html reads the payload of each row
+        from the blob store), where filters rows (e.g.
+        db.table("search_responses").c.status_code == 200), and chunksize
+        returns an iterator of DataFrames of at most chunksize rows instead of
+        a single DataFrame.
+        """
+        tableObj: Table = self.table(name=table)
+
+        statement: Select = select(tableObj)
+        if columns is not None:
+            columns = [
+                "payload_sha256" if column == "html" else column
+                for column in columns
+            ]
+
+            statement = select(
+                tableObj.c.id,
+                *[tableObj.c[column] for column in columns if column != "id"],
+            )
+
+        if where is not None:
+            statement = statement.where(where)
+
+        if chunksize is None:
+            df: DataFrame = pandas.read_sql_query(
+                sql=statement,
+                con=self.engine,
+                index_col="id",
+            )
+
+            if loadPayloads:
+                self.loadPayloadColumn(df=df)
+
+            return df
+
+        return self._readChunks(
+            statement=statement,
+            chunksize=chunksize,
+            loadPayloads=loadPayloads,
+        )
+
+    def _readChunks(
+        self,
+        statement: Select,
+        chunksize: int,
+        loadPayloads: bool,
+    ) -> Iterator[DataFrame]:
+        with self.engine.connect() as conn:
+            df: DataFrame
+            for df in pandas.read_sql_query(
+                sql=statement,
+                con=conn.execution_options(stream_results=True),
+                index_col="id",
+                chunksize=chunksize,
+            ):
+                if loadPayloads:
+                    self.loadPayloadColumn(df=df)
+
+                yield df
+
+    def storePayloadColumn(self, df: DataFrame) -> None:
+        """
+        Moves the html column of df into the blob store in place, leaving its
+        payload_sha256 and payload_length
+        """
+        stored: List[Tuple[str, int]] = [
+            self.blobs.put(payload=payload) for payload in df["html"]
+        ]
+
+        df["payload_sha256"] = [digest for digest, _ in stored]
+        df["payload_length"] = [length for _, length in stored]
+        df.drop(columns="html", inplace=True)
+
+    def loadPayloadColumn(self, df: DataFrame) -> None:
+        """
+        Reads the payloads referenced by the payload_sha256 column of df into
+        an html column in place
+        """
+        if "payload_sha256" not in df.columns:
+            return None
+
+        df["html"] = [
+            self.blobs.get(digest=digest) for digest in df["payload_sha256"]
+        ]
+
+    def countRows(
+        self,
+        table: str,
+        where: ColumnElement[bool] | None = None,
+    ) -> int:
+        statement: Select = select(func.count()).select_from(
+            self.table(name=table)
+        )
+
+        if where is not None:
+            statement = statement.where(where)
+
+        with self.engine.connect() as conn:
+            return conn.execute(statement).scalar_one()
+
+    def migratePayloads(self, chunksize: int = 1000) -> None:
+        """
+        Move the html payloads of a database created before the blob store
+        into it, then drop the html and codec columns and reclaim the space
+        """
+        table: str
+        for table in ["search_responses", "openalex_responses"]:
+            # Reflected, as the declared tables already use the new columns
+            tableObj: Table = Table(
+                table,
+                MetaData(),
+                autoload_with=self.engine,
+            )
+
+            if "html" not in tableObj.c:
+                continue
+
+            # Columns added by an interrupted migration are reused. Databases
+            # older than payload compression have no codec column; it is
+            # added as NULL, which marks the html as uncompressed text.
+            # SQLAlchemy has no ALTER TABLE construct, so the DDL is raw SQL
+            # built only from this fixed table list and column constants.
+            columns: set[str] = {
+                column["name"]
+                for column in inspect(self.engine).get_columns(table)
+            }
+            with self.engine.begin() as conn:
+                column: str
+                columnType: str
+                for column, columnType in [
+                    ("codec", "TEXT"),
+                    ("payload_sha256", "TEXT"),
+                    ("payload_length", "INTEGER"),
+                ]:
+                    if column not in columns:
+                        conn.exec_driver_sql(
+                            f"ALTER TABLE {table} "
+                            f"ADD COLUMN {column} {columnType}"
+                        )
+
+            tableObj = Table(table, MetaData(), autoload_with=self.engine)
+            updateSQL: Update = (
+                update(tableObj)
+                .where(tableObj.c.id == bindparam("_id"))
+                .values(
+                    payload_sha256=bindparam("_sha256"),
+                    payload_length=bindparam("_length"),
+                )
+            )
+
+            with self.engine.connect() as reader:
+                df: DataFrame
+                for df in pandas.read_sql_query(
+                    sql=select(
+                        tableObj.c.id,
+                        tableObj.c.html,
+                        tableObj.c.codec,
+                    ),
+                    con=reader.execution_options(stream_results=True),
+                    chunksize=chunksize,
+                ):
+                    if df.shape[0] == 0:
+                        continue
+
+                    df["html"] = [
+                        readLegacyPayload(blob=blob, codec=codec)
+                        for blob, codec in zip(df["html"], df["codec"])
+                    ]
+                    self.storePayloadColumn(df=df)
+
+                    with self.engine.begin() as conn:
+                        conn.execute(
+                            updateSQL,
+                            [
+                                {
+                                    "_id": rowID,
+                                    "_sha256": sha256,
+                                    "_length": length,
+                                }
+                                for rowID, sha256, length in zip(
+                                    df["id"].astype(int).tolist(),
+                                    df["payload_sha256"],
+                                    df["payload_length"].astype(int).tolist(),
+                                )
+                            ],
+                        )
+
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN html")
+                conn.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN codec")
+
+        with self.engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.exec_driver_sql("VACUUM")
@@ -1,4 +1,3 @@
-from json import loads
 from pathlib import Path
 from typing import List
 
@@ -9,7 +8,7 @@ from progress.bar import Bar
 from requests import Response, get
 
 from src.filter import FIELD_FILTER
-from src.utils import ifFileExistsExit
+from src.utils import ifFileExistsExit, loads
 
 
 def getOA(email: str, doi: str) -> Response:
@@ -0,0 +1,203 @@
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import pyarrow.parquet as pq
+from pandas import DataFrame, Series
+from progress.bar import Bar
+from pyarrow import RecordBatch
+
+from src.db import DB
+
+# FTS5 virtual tables, their MATCH operator and auxiliary functions
+# (highlight, snippet, bm25) have no SQLAlchemy constructs, so the index is
+# queried with raw SQL. Only these constants are interpolated; queries and
+# other user input are always bound as parameters.
+FTS_TABLE: str = "papers_fts"
+
+# Indexed columns of transformed papers, in FTS5 column order after doi
+FTS_COLUMNS: List[str] = ["titles", "abstracts", "content"]
+
+# Wrapped around every match by highlight() so hits can be counted
+HIT_START: str = "\x01"
+HIT_END: str = "\x02"
+
+
+def phraseQuery(phrase: str) -> str:
+    """
+    Quote phrase as an FTS5 phrase, which matches its tokens in order
+    """
+    return '"' + phrase.replace('"', '""') + '"'
+
+
+def nearQuery(terms: List[str], distance: int = 10) -> str:
+    """
+    Match documents where every term occurs within distance tokens of the
+    others
+    """
+    return f"NEAR({' '.join(phraseQuery(term) for term in terms)}, {distance})"
+
+
+class PaperIndex:
+    """
+    SQLite FTS5 index of transformed papers (doi, titles, abstracts, content)
+    stored in the AIUS database.
+
+    Text is tokenized with unicode61 and stemmed with porter, so "networks"
+    matches "network". Phrase and NEAR hit counts come from the index rather
+    than from scanning every paper.
+    """
+
+    def __init__(self, db: DB) -> None:
+        self.db: DB = db
+
+    def create(self) -> None:
+        with self.db.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"doi UNINDEXED, {', '.join(FTS_COLUMNS)}, "
+                "tokenize = 'porter unicode61')"
+            )
+
+    def index(self, df: DataFrame, documentIDs: Series) -> None:
+        """
+        Add or replace the papers of df. Papers are keyed by their documents
+        id (documentIDs maps DOIs to ids) so replacing one is a rowid lookup.
+        """
+        data: DataFrame = df[["doi", *FTS_COLUMNS]].fillna(value="")
+        data.insert(loc=0, column="rowid", value=data["doi"].map(documentIDs))
+
+        rows: List[Tuple[int | str, ...]] = [
+            (int(row[0]), *[str(value) for value in row[1:]])
+            for row in data.itertuples(index=False, name=None)
+        ]
+
+        with self.db.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"INSERT OR REPLACE INTO {FTS_TABLE} "
+                f"(rowid, doi, {', '.join(FTS_COLUMNS)}) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def indexParquet(self, fp: Path, batchSize: int = 1000) -> None:
+        """
+        Index a transformed papers parquet file batch by batch. DOIs missing
+        from the documents table are added to it.
+        """
+        self.create()
+
+        parquetFile: pq.ParquetFile = pq.ParquetFile(source=fp)
+
+        self.db.bulkInsert(
+            table="documents",
+            data=parquetFile.read(columns=["doi"]).to_pandas(),
+            orIgnore=True,
+        )
+        documentIDs: Series = self.db.keyMap(dimension="doi")
+
+        with Bar(
+            "Indexing papers...",
+            max=parquetFile.metadata.num_rows,
+        ) as bar:
+            batch: RecordBatch
+            for batch in parquetFile.iter_batches(
+                batch_size=batchSize,
+                columns=["doi", *FTS_COLUMNS],
+            ):
+                self.index(df=batch.to_pandas(), documentIDs=documentIDs)
+                bar.next(n=batch.num_rows)
+
+        with self.db.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"INSERT INTO {FTS_TABLE} "  # nosec B608
+                f"({FTS_TABLE}) VALUES ('optimize')"
+            )
+
+    def _iterHighlights(self, query: str) -> Iterator[Tuple[str, ...]]:
+        highlights: str = ", ".join(
+            f"highlight({FTS_TABLE}, {idx}, ?, ?)"
+            for idx in range(1, len(FTS_COLUMNS) + 1)
+        )
+
+        with self.db.engine.connect() as conn:
+            yield from conn.exec_driver_sql(
+                f"SELECT doi, {highlights} FROM {FTS_TABLE} "  # nosec B608
+                f"WHERE {FTS_TABLE} MATCH ?",
+                (*[HIT_START, HIT_END] * len(FTS_COLUMNS), query),
+            )
+
+    def countMatches(self, query: str) -> Series:
+        """
+        Number of hits of an FTS5 query in each matching paper, summed over
+        titles, abstracts, and content
+        """
+        data: dict[str, int] = {}
+
+        row: Tuple[str, ...]
+        for row in self._iterHighlights(query=query):
+            data[row[0]] = sum(text.count(HIT_START) for text in row[1:])
+
+        return Series(data=data, dtype=int)
+
+    def dois(self) -> List[str]:
+        sql: str = f"SELECT doi FROM {FTS_TABLE}"  # nosec B608
+
+        with self.db.engine.connect() as conn:
+            return [row[0] for row in conn.exec_driver_sql(sql)]
+
+    def phraseCounts(self, phrases: List[str]) -> DataFrame:
+        """
+        Hits per paper (rows) of each phrase (columns), zero where absent
+        """
+        return self._countTable(
+            queries={phrase: phraseQuery(phrase=phrase) for phrase in phrases}
+        )
+
+    def nearCounts(
+        self,
+        phrases: List[str],
+        distance: int = 10,
+    ) -> DataFrame:
+        """
+        Per paper (rows), the number of word instances of each phrase
+        (columns) that occur within distance tokens of the phrase's other
+        words, in any order
+        """
+        return self._countTable(
+            queries={
+                phrase: nearQuery(terms=phrase.split(), distance=distance)
+                for phrase in phrases
+            }
+        )
+
+    def _countTable(self, queries: dict[str, str]) -> DataFrame:
+        df: DataFrame = DataFrame(index=self.dois())
+        df.index.name = "doi"
+
+        name: str
+        query: str
+        for name, query in queries.items():
+            df[name] = (
+                self.countMatches(query=query)
+                .reindex(index=df.index, fill_value=0)
+                .to_numpy()
+            )
+
+        return df.reset_index()
+
+    def search(self, query: str, limit: int = 20) -> DataFrame:
+        """
+        The best matching papers of an FTS5 query ranked by bm25
+        """
+        with self.db.engine.connect() as conn:
+            rows: List[Tuple[str, float, str]] = list(
+                conn.exec_driver_sql(
+                    f"SELECT doi, bm25({FTS_TABLE}), "  # nosec B608
+                    f"snippet({FTS_TABLE}, -1, '[', ']', '...', 16) "
+                    f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ? "
+                    "ORDER BY rank LIMIT ?",
+                    (query, limit),
+                )
+            )
+
+        return DataFrame(data=rows, columns=["doi", "bm25", "snippet"])
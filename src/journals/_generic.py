@@ -1,5 +1,5 @@
 from abc import ABCMeta, abstractmethod
-from typing import List
+from typing import Any, Callable, List
 
 from bs4 import BeautifulSoup
 from pandas import DataFrame
@@ -7,7 +7,14 @@ from pandas import DataFrame
 
 class Journal_ABC(metaclass=ABCMeta):
     @abstractmethod
-    def searchJournal(self, query: str, year: int) -> DataFrame:
+    def searchJournal(
+        self,
+        query: str,
+        year: int,
+        showProgress: bool = True,
+        skipPages: set[int] = set(),
+        onPage: Callable[[dict[str, Any]], None] | None = None,
+    ) -> DataFrame:
         pass
 
     @abstractmethod
@@ -1,20 +1,89 @@
 from collections import defaultdict
-from json import loads
 from string import Template
-from typing import List
+from sys import stderr
+from typing import Any, List
 
 from bs4 import BeautifulSoup, ResultSet, Tag
+from lxml import etree
 from pandas import DataFrame
 from progress.bar import Bar
 from requests import Response
 
 from src.journals._generic import Journal_ABC
-from src.search import Search, SearchResultDataFrameSchema
-from src.utils import formatText
+from src.search import (
+    SEARCH_RESULTS_STOR,
+    Search,
+    SearchPageCallback,
+    searchResultRow,
+    searchResultsDF,
+    sharedSearch,
+)
+from src.utils import formatText, loads
+
+NATURE_DOI_PREFIX: str = "10.1038/"
+
+# Elements whose class attribute contains the given class token, matching
+# BeautifulSoup's find_all(attrs={"class": ...})
+CARD_LINK_XPATH: etree.XPath = etree.XPath(
+    '//a[contains(concat(" ", normalize-space(@class), " "), '
+    '" c-card__link ")]/@href'
+)
+PAGINATION_ITEM_XPATH: etree.XPath = etree.XPath(
+    '//li[contains(concat(" ", normalize-space(@class), " "), '
+    '" c-pagination__item ")]'
+)
+
+
+def _parseHTML(html: str | bytes) -> etree._Element | None:
+    # libxml2's HTML parser builds the tree in C without the BeautifulSoup
+    # object model; None is returned for empty documents
+    return etree.HTML(html) if html else None
+
+
+def _searchResultDOIs(root: etree._Element) -> List[str]:
+    return [
+        NATURE_DOI_PREFIX + str(href).split("/")[-1]
+        for href in CARD_LINK_XPATH(root)
+    ]
+
+
+def _maxPage(root: etree._Element) -> int | None:
+    items: List[etree._Element] = PAGINATION_ITEM_XPATH(root)
+
+    if len(items) < 2 or items[-2].get("data-page") is None:
+        return None
+
+    return int(items[-2].get("data-page"))
+
+
+def extractSearchResultDOIs(html: str | bytes) -> List[str]:
+    """
+    DOIs of the articles listed on a Nature search results page
+    """
+    root: etree._Element | None = _parseHTML(html=html)
+
+    if root is None:
+        return []
+
+    return _searchResultDOIs(root=root)
+
+
+def extractMaxPage(html: str | bytes) -> int | None:
+    """
+    Last page number of a Nature search, read from the pagination of a results
+    page; the last pagination item is the next page link
+    """
+    root: etree._Element | None = _parseHTML(html=html)
+
+    if root is None:
+        return None
+
+    return _maxPage(root=root)
 
 
 class Nature(Journal_ABC):
-    def __init__(self) -> None:
+    def __init__(self, search: Search | None = None) -> None:
+        self.search: Search = search if search is not None else sharedSearch()
         self.journalName: str = "Nature"
         self.paperURLTemplate: Template = Template(
             template="https://journals.plos.org/plosone/article?id=${paperID}"
@@ -24,55 +93,83 @@ class Nature(Journal_ABC):
             template="https://www.nature.com/search?q=${query}&order=date_desc&article_type=research&date_range=${year}-${year}&page=${page}"  # noqa: E501
         )
 
-    def searchJournal(self, query: str, year: int) -> DataFrame:
+    def searchJournal(
+        self,
+        query: str,
+        year: int,
+        showProgress: bool = True,
+        skipPages: set[int] = set(),
+        onPage: SearchPageCallback | None = None,
+    ) -> DataFrame:
         data: defaultdict[str, list] = defaultdict(list)
         page: int = 1
         maxPage: int = 1
 
-        with Bar(f"Conducting search for {query} in {year}...", max=1) as bar:
+        with Bar(
+            f"Conducting search for {query} in {year}...",
+            max=1,
+            file=stderr if showProgress else None,
+        ) as bar:
             while True:
                 if page > maxPage:
                     break
 
+                # Page 1 is always requested to learn the page range
+                if page > 1 and page in skipPages:
+                    bar.next()
+                    page += 1
+                    continue
+
                 url: str = self.searchURLTemplate.substitute(
                     query=query.replace(" ", "+"),
                     year=year,
                     page=page,
                 )
 
-                resp: Response = Search().search(url=url)
+                resp: Response | None = self.search.search(url=url)
+
+                # Each page is parsed once, while the response is in memory,
+                # for both its DOIs and (on page 1) the page range
+                root: etree._Element | None = None
+                if resp is not None and resp.status_code == 200:
+                    root = _parseHTML(html=resp.content)
+
+                if page not in skipPages:
+                    row: dict[str, Any] = searchResultRow(
+                        year=year,
+                        query=query,
+                        page=page,
+                        url=url,
+                        resp=resp,
+                        journal=self.journalName,
+                        dois=(
+                            None
+                            if root is None
+                            else _searchResultDOIs(root=root)
+                        ),
+                    )
 
-                data["year"].append(year)
-                data["query"].append(query)
-                data["page"].append(page)
-                data["url"].append(url)
-                data["status_code"].append(resp.status_code)
-                data["html"].append(resp.content.decode(errors="ignore"))
-                data["journal"].append(self.journalName)
+                    # Pages handed to onPage are stored by the caller, so
+                    # they are not kept here as well
+                    if onPage is None:
+                        key: str
+                        for key in SEARCH_RESULTS_STOR:
+                            data[key].append(row[key])
+                    else:
+                        onPage(row)
 
-                if page == 1:
-                    htmlSoup: BeautifulSoup = BeautifulSoup(
-                        markup=resp.content,
-                        features="lxml",
-                    )
-                    nextPages: ResultSet[Tag] = htmlSoup.find_all(
-                        name="li",
-                        attrs={"class": "c-pagination__item"},
-                    )
+                if page == 1 and root is not None:
+                    lastPage: int | None = _maxPage(root=root)
 
-                    if nextPages.__len__() > 0:
-                        maxPage: int = int(nextPages[-2].get(key="data-page"))
+                    if lastPage is not None:
+                        maxPage = lastPage
                         bar.max = maxPage
                         bar.update()
 
                 bar.next()
                 page += 1
 
-        df: DataFrame = DataFrame(data=data)
-
-        SearchResultDataFrameSchema(df=df)
-
-        return df
+        return searchResultsDF(data=data)
 
     def extractPaperURLsFromSearchResult(self, respContent: str) -> List[str]:
         data: List[str] = []
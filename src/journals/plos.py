@@ -1,8 +1,9 @@
 from collections import defaultdict
-from json import loads
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from math import ceil
 from string import Template
-from typing import List
+from sys import stderr
+from typing import Any, List, Tuple
 
 from bs4 import BeautifulSoup, ResultSet, Tag
 from pandas import DataFrame
@@ -10,12 +11,25 @@ from progress.bar import Bar
 from requests import Response
 
 from src.journals._generic import Journal_ABC
-from src.search import Search, SearchResultDataFrameSchema
-from src.utils import formatText
+from src.search import (
+    SEARCH_RESULTS_STOR,
+    Search,
+    SearchPageCallback,
+    searchResultRow,
+    searchResultsDF,
+    sharedSearch,
+)
+from src.utils import formatText, loads
 
 
 class PLOS(Journal_ABC):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        search: Search | None = None,
+        pageWorkers: int = 8,
+    ) -> None:
+        self.search: Search = search if search is not None else sharedSearch()
+        self.pageWorkers: int = pageWorkers
         self.journalName: str = "PLOS"
         self.paperURLTemplate: Template = Template(
             template="https://journals.plos.org/plosone/article?id=${paperID}"
@@ -24,50 +38,123 @@ class PLOS(Journal_ABC):
             template="https://journals.plos.org/plosone/dynamicSearch?filterStartDate=${year}-01-01&filterEndDate=${year}-12-31&resultsPerPage=100&q=${query}&sortOrder=DATE_NEWEST_FIRST&page=${page}&filterArticleTypes=Research Article&unfilteredQuery=${query}"  # noqa: E501
         )
 
-    def searchJournal(self, query: str, year: int) -> DataFrame:
-        data: defaultdict[str, list] = defaultdict(list)
-        page: int = 1
-        maxPage: int = 1
-
-        with Bar(f"Conducting search for {query} in {year}...", max=1) as bar:
-            while True:
-                if page > maxPage:
-                    break
-
-                url: str = self.searchURLTemplate.substitute(
-                    query=query,
-                    year=year,
-                    page=page,
-                )
-
-                resp: Response = Search().search(url=url)
-
-                data["year"].append(year)
-                data["query"].append(query)
-                data["page"].append(page)
-                data["url"].append(url)
-                data["status_code"].append(resp.status_code)
-                data["html"].append(resp.content.decode(errors="ignore"))
-                data["journal"].append(self.journalName)
-
-                if page == 1:
-                    json: dict[str, str] = resp.json()
-
-                    documentsFound: int = json["searchResults"]["numFound"]
-
-                    if documentsFound >= 100:
-                        maxPage: int = ceil(documentsFound / 100)
-                        bar.max = maxPage
-                        bar.update()
-
-                bar.next()
-                page += 1
+    def _fetchPage(
+        self,
+        query: str,
+        year: int,
+        page: int,
+    ) -> Tuple[int, dict[str, Any]]:
+        """
+        Fetch a search page, returning the number of documents the search
+        found and the page's row. The response is decoded once, here, for
+        both the page range and the DOIs listed on the page.
+        """
+        url: str = self.searchURLTemplate.substitute(
+            query=query,
+            year=year,
+            page=page,
+        )
 
-        df: DataFrame = DataFrame(data=data)
+        resp: Response | None = self.search.search(url=url)
+
+        documentsFound: int = 0
+        dois: List[str] | None = None
+
+        if resp is not None and resp.status_code == 200:
+            try:
+                searchResults: dict = loads(s=resp.content)["searchResults"]
+                documentsFound = searchResults["numFound"]
+                dois = [doc["id"] for doc in searchResults["docs"]]
+            except (ValueError, KeyError):
+                pass
+
+        return (
+            documentsFound,
+            searchResultRow(
+                year=year,
+                query=query,
+                page=page,
+                url=url,
+                resp=resp,
+                journal=self.journalName,
+                dois=dois,
+            ),
+        )
 
-        SearchResultDataFrameSchema(df=df)
+    def _maxPage(self, documentsFound: int) -> int:
+        return max(ceil(documentsFound / 100), 1)
+
+    def searchJournal(
+        self,
+        query: str,
+        year: int,
+        showProgress: bool = True,
+        skipPages: set[int] = set(),
+        onPage: SearchPageCallback | None = None,
+    ) -> DataFrame:
+        data: defaultdict[str, list] = defaultdict(list)
+        rows: dict[int, dict[str, Any]] = {}
+
+        with Bar(
+            f"Conducting search for {query} in {year}...",
+            max=1,
+            file=stderr if showProgress else None,
+        ) as bar:
+            # Page 1 is always requested as it is the only way to learn the
+            # page range, but it is only emitted if it is not already stored
+            documentsFound: int
+            row: dict[str, Any]
+            documentsFound, row = self._fetchPage(
+                query=query,
+                year=year,
+                page=1,
+            )
 
-        return df
+            # Pages handed to onPage are stored by the caller, so they are not
+            # kept here as well and the returned frame is empty
+            if 1 not in skipPages:
+                if onPage is None:
+                    rows[1] = row
+                else:
+                    onPage(row)
+
+            maxPage: int = self._maxPage(documentsFound=documentsFound)
+            pages: List[int] = [
+                page for page in range(2, maxPage + 1) if page not in skipPages
+            ]
+            bar.max = len(pages) + 1
+            bar.update()
+            bar.next()
+
+            # The page range is known once page 1 returns, so the remaining
+            # pages are fetched concurrently and reassembled in page order
+            with ThreadPoolExecutor(max_workers=self.pageWorkers) as executor:
+                futures: dict[Future, int] = {
+                    executor.submit(
+                        self._fetchPage,
+                        query=query,
+                        year=year,
+                        page=page,
+                    ): page
+                    for page in pages
+                }
+
+                future: Future
+                for future in as_completed(fs=futures):
+                    row = future.result()[1]
+                    if onPage is None:
+                        rows[futures[future]] = row
+                    else:
+                        onPage(row)
+                    bar.next()
+
+        page: int
+        for page in sorted(rows):
+            key: str
+            for key in SEARCH_RESULTS_STOR:
+                data[key].append(rows[page][key])
+
+        return searchResultsDF(data=data)
 
     def extractPaperURLsFromSearchResult(self, respContent: str) -> List[str]:
         data: List[str] = []
@@ -1,22 +1,48 @@
 import sys
 from argparse import ArgumentParser, Namespace, _SubParsersAction
+from array import array
 from collections import defaultdict
-from json import dumps, loads
-from math import ceil
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
-from typing import Any, List
+from threading import Lock
+from typing import Any, List, Tuple
 
-import pandas
-from bs4 import BeautifulSoup, ResultSet, Tag
+import numpy
 from pandas import DataFrame, Series
 from progress.bar import Bar
-from requests import Response, get
+from requests import Response
+from sqlalchemy import Table, exists
+from sqlalchemy.sql.elements import ColumnElement
 
-from src import searchFunc
+from src import SEARCH_KEYWORDS, dataset, searchFunc
+from src.dataset import ROW_GROUP_SIZE
 from src.db import DB
-from src.utils import ifFileExistsExit
-
-COMMANDS: set[str] = {"init", "search", "ed", "oa"}
+from src.fts import PaperIndex
+from src.journals.nature import extractSearchResultDOIs
+from src.openalex import DOI_URL, MAX_DOI_BATCH_SIZE
+from src.openalex.client import AsyncOpenAlexClient
+from src.openalex.snapshot import iterSnapshotWorks
+from src.openalex.works import WorkRows, iterWorks
+from src.search import (
+    TIMEOUT_STATUS_CODE,
+    SearchPageCallback,
+    configureSharedSearch,
+)
+from src.search.cache import ResponseCache
+from src.search.scheduler import CompletedPages, SearchScheduler
+from src.utils import dumpBytes, ifFileExistsExit, loads
+
+COMMANDS: set[str] = {
+    "init",
+    "search",
+    "ed",
+    "oa",
+    "db",
+    "export",
+    "import",
+    "fts",
+}
 
 
 def cliParser() -> Namespace:
@@ -63,6 +89,66 @@ def cliParser() -> Namespace:
         help="Journal to search through",
         dest="search.journal",
     )
+    searchParser.add_argument(
+        "--pool-size",
+        nargs=1,
+        default=[16],
+        type=int,
+        help="Number of keep-alive connections to pool per host",
+        dest="search.pool_size",
+    )
+    searchParser.add_argument(
+        "--cache-dir",
+        nargs=1,
+        default=[Path("aius-cache")],
+        type=Path,
+        help="Directory of the on-disk HTTP response cache",
+        dest="search.cache_dir",
+    )
+    searchParser.add_argument(
+        "--cache-ttl",
+        nargs=1,
+        default=[7 * 24],
+        type=float,
+        help="Hours before a cached response is revalidated",
+        dest="search.cache_ttl",
+    )
+    searchParser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch responses from the network",
+        dest="search.no_cache",
+    )
+    searchParser.add_argument(
+        "--page-workers",
+        nargs=1,
+        default=[8],
+        type=int,
+        help="Maximum number of result pages to fetch concurrently",
+        dest="search.page_workers",
+    )
+    searchParser.add_argument(
+        "--workers",
+        nargs=1,
+        default=[8],
+        type=int,
+        help="Maximum number of keyword/year searches to run concurrently",
+        dest="search.workers",
+    )
+    searchParser.add_argument(
+        "--workers-per-journal",
+        nargs=1,
+        default=[4],
+        type=int,
+        help="Maximum number of concurrent keyword/year searches per journal",
+        dest="search.workers_per_journal",
+    )
+    searchParser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip pages already stored with a 200 status code",
+        dest="search.resume",
+    )
 
     edParser: ArgumentParser = subparser.add_parser(
         name="extract-documents",
@@ -77,6 +163,14 @@ def cliParser() -> Namespace:
         help="Path to AIUS SQLite3 database",
         dest="ed.db",
     )
+    edParser.add_argument(
+        "--workers",
+        nargs=1,
+        default=[1],
+        type=int,
+        help="Number of processes parsing search responses in parallel",
+        dest="ed.workers",
+    )
 
     oaParser: ArgumentParser = subparser.add_parser(
         name="openalex",
@@ -99,6 +193,204 @@ def cliParser() -> Namespace:
         help="Email address to access OpenAlex polite pool",
         dest="oa.email",
     )
+    oaParser.add_argument(
+        "--snapshot",
+        nargs=1,
+        type=Path,
+        help="Read works from a local OpenAlex snapshot directory of gzipped JSON Lines partitions instead of the API",  # noqa: E501
+        dest="oa.snapshot",
+    )
+    oaParser.add_argument(
+        "--batch-size",
+        nargs=1,
+        default=[MAX_DOI_BATCH_SIZE],
+        type=int,
+        choices=range(1, MAX_DOI_BATCH_SIZE + 1),
+        metavar=f"[1-{MAX_DOI_BATCH_SIZE}]",
+        help="Number of DOIs to look up per OpenAlex request",
+        dest="oa.batch_size",
+    )
+    oaParser.add_argument(
+        "--concurrency",
+        nargs=1,
+        default=[8],
+        type=int,
+        help="Maximum number of OpenAlex requests in flight",
+        dest="oa.concurrency",
+    )
+    oaParser.add_argument(
+        "--archive-json",
+        action="store_true",
+        help="Also store the raw JSON of every work in openalex_responses",
+        dest="oa.archive_json",
+    )
+    oaParser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Only look up documents whose earlier OpenAlex request failed",
+        dest="oa.retry_failed",
+    )
+    oaParser.add_argument(
+        "--pool-size",
+        nargs=1,
+        default=[16],
+        type=int,
+        help="Number of keep-alive connections to pool per host",
+        dest="oa.pool_size",
+    )
+    oaParser.add_argument(
+        "--cache-dir",
+        nargs=1,
+        default=[Path("aius-cache")],
+        type=Path,
+        help="Directory of the on-disk HTTP response cache",
+        dest="oa.cache_dir",
+    )
+    oaParser.add_argument(
+        "--cache-ttl",
+        nargs=1,
+        default=[7 * 24],
+        type=float,
+        help="Hours before a cached response is revalidated",
+        dest="oa.cache_ttl",
+    )
+    oaParser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch responses from the network",
+        dest="oa.no_cache",
+    )
+
+    dbParser: ArgumentParser = subparser.add_parser(
+        name="db",
+        help="Maintain the AIUS SQLite3 database",
+    )
+    dbParser.add_argument(
+        "db.action",
+        metavar="action",
+        nargs=1,
+        type=str,
+        choices=["analyze", "migrate"],
+        help="analyze: create missing indexes, run ANALYZE, and report query plans; migrate: move payloads stored in SQLite into the blob store",  # noqa: E501
+    )
+    dbParser.add_argument(
+        "-d",
+        "--db",
+        nargs=1,
+        default=[Path("aius.sqlite3")],
+        type=Path,
+        help="Path to AIUS SQLite3 database",
+        dest="db.db",
+    )
+
+    exportParser: ArgumentParser = subparser.add_parser(
+        name="export",
+        help="Export the AIUS database as Parquet datasets",
+    )
+    exportParser.add_argument(
+        "-d",
+        "--db",
+        nargs=1,
+        default=[Path("aius.sqlite3")],
+        type=Path,
+        help="Path to AIUS SQLite3 database",
+        dest="export.db",
+    )
+    exportParser.add_argument(
+        "-o",
+        "--output",
+        nargs=1,
+        default=[Path("aius-dataset")],
+        type=Path,
+        help="Directory to write one Hive partitioned dataset per table",
+        dest="export.output",
+    )
+    exportParser.add_argument(
+        "--row-group-size",
+        nargs=1,
+        default=[ROW_GROUP_SIZE],
+        type=int,
+        help="Rows per Parquet row group",
+        dest="export.row_group_size",
+    )
+
+    importParser: ArgumentParser = subparser.add_parser(
+        name="import",
+        help="Create an AIUS database from exported Parquet datasets (payloads are read from the blob store next to the new database)",  # noqa: E501
+    )
+    importParser.add_argument(
+        "-d",
+        "--db",
+        nargs=1,
+        default=[Path("aius.sqlite3")],
+        type=Path,
+        help="Path to create AIUS SQLite3 database",
+        dest="import.db",
+    )
+    importParser.add_argument(
+        "-i",
+        "--input",
+        nargs=1,
+        default=[Path("aius-dataset")],
+        type=Path,
+        help="Directory of datasets written by aius export",
+        dest="import.input",
+    )
+
+    ftsParser: ArgumentParser = subparser.add_parser(
+        name="fts",
+        help="Full-text index and search transformed papers",
+    )
+    ftsParser.add_argument(
+        "fts.action",
+        metavar="action",
+        nargs=1,
+        type=str,
+        choices=["index", "count", "query"],
+        help="index: add a transformed papers parquet file to the index; count: write per paper hit counts of every search keyword; query: print the best matches of an FTS5 query",  # noqa: E501
+    )
+    ftsParser.add_argument(
+        "-d",
+        "--db",
+        nargs=1,
+        default=[Path("aius.sqlite3")],
+        type=Path,
+        help="Path to AIUS SQLite3 database",
+        dest="fts.db",
+    )
+    ftsParser.add_argument(
+        "-i",
+        "--input",
+        nargs=1,
+        type=Path,
+        help="Transformed papers parquet file with doi, titles, abstracts, and content columns",  # noqa: E501
+        dest="fts.input",
+    )
+    ftsParser.add_argument(
+        "-o",
+        "--output",
+        nargs=1,
+        default=[Path("keyword_counts.csv")],
+        type=Path,
+        help="CSV file to write keyword counts to",
+        dest="fts.output",
+    )
+    ftsParser.add_argument(
+        "--near",
+        nargs=1,
+        default=[None],
+        type=int,
+        help="Count the words of each keyword within this many tokens of each other instead of exact phrases",  # noqa: E501
+        dest="fts.near",
+    )
+    ftsParser.add_argument(
+        "-q",
+        "--query",
+        nargs=1,
+        type=str,
+        help="FTS5 query, e.g. '\"deep learning\" OR NEAR(model weights, 5)'",
+        dest="fts.query",
+    )
 
     return parser.parse_args()
 
@@ -111,207 +403,491 @@ def initialize(fp: Path) -> DB:
     return db
 
 
-def _mapDFIndexToDFValue(
-    df1: DataFrame,
-    df2: DataFrame,
-    c1: str,
-    c2: str,
+# search_responses column -> dimension of its natural key
+SEARCH_RESPONSE_KEYS: dict[str, str] = {
+    "year": "year",
+    "keyword": "keyword",
+    "journal": "journal",
+}
+
+
+def _writeSearchResponse(
+    row: dict[str, Any],
+    db: DB,
+    keyMaps: dict[str, Series],
+    lock: Lock,
 ) -> None:
-    """
-    Modifies df2 in place
-    """
-    replacementValues: Series = df1[c1]
+    df: DataFrame = DataFrame(data=[row]).drop(columns="dois")
+    df.rename(columns={"query": "keyword"}, inplace=True)
 
-    val: Any
-    for val in replacementValues:
-        df2.loc[df2[c2] == val, c2] = int(
-            replacementValues[replacementValues == val].index[0]
-        )
+    db.resolveKeys(df=df, columns=SEARCH_RESPONSE_KEYS, keyMaps=keyMaps)
+    db.storePayloadColumn(df=df)
+
+    with lock:
+        # DOIs captured by the journal at crawl time are written with the
+        # page, so extract-documents does not have to parse it again
+        if row["dois"] is None:
+            db.bulkInsert(table="search_responses", data=df)
+        else:
+            db.writeSearchResponse(
+                response=df.astype(dtype=object).to_dict(orient="records")[0],
+                dois=row["dois"],
+            )
 
 
-def search(fp: Path, journal: str) -> None:
-    df: DataFrame | None = None
+def search(
+    fp: Path,
+    journal: str,
+    pageWorkers: int = 8,
+    workers: int = 8,
+    workersPerJournal: int = 4,
+    resume: bool = False,
+) -> None:
+    scheduler: SearchScheduler = SearchScheduler(
+        maxWorkers=workers,
+        maxWorkersPerJournal=workersPerJournal,
+    )
 
     db: DB = DB(fp=fp)
 
+    # Every page is committed as soon as it is fetched so that an
+    # interrupted crawl can be resumed without refetching stored pages
+    completedPages: CompletedPages = (
+        db.readCompletedSearchPages() if resume else {}
+    )
+    writePage: SearchPageCallback = partial(
+        _writeSearchResponse,
+        db=db,
+        keyMaps={
+            dimension: db.keyMap(dimension=dimension)
+            for dimension in SEARCH_RESPONSE_KEYS.values()
+        },
+        lock=Lock(),
+    )
+
     match journal:
         case "nature":
-            df = searchFunc.nature()
+            searchFunc.nature(
+                scheduler=scheduler,
+                completedPages=completedPages,
+                onPage=writePage,
+            )
         case "plos":
-            df = searchFunc.plos()
+            searchFunc.plos(
+                pageWorkers=pageWorkers,
+                scheduler=scheduler,
+                completedPages=completedPages,
+                onPage=writePage,
+            )
         case "science":
             searchFunc.science()
             return None
         case _:
             return None
 
-    df.rename(columns={"query": "keyword"}, inplace=True)
 
-    yearsDF: DataFrame = db.readTableToDF(table="years")
-    keywordsDF: DataFrame = db.readTableToDF(table="keywords")
-    journalsDF: DataFrame = db.readTableToDF(table="journals")
+def _extractDOIs(journal: str, html: str) -> List[str]:
+    match journal:
+        case "Nature":
+            return extractSearchResultDOIs(html=html)
+        case "PLOS":
+            json: dict[str, Any] = loads(s=html)
+            docs: List[dict[str, Any]] = json["searchResults"]["docs"]
+
+            return [doc["id"] for doc in docs]
+        case _:
+            return []
 
-    _mapDFIndexToDFValue(yearsDF, df, "year", "year")
-    _mapDFIndexToDFValue(
-        keywordsDF,
-        df,
-        "keyword",
-        "keyword",
-    )
-    _mapDFIndexToDFValue(
-        journalsDF,
-        df,
-        "journal",
-        "journal",
-    )
 
-    df.to_sql(
-        name="search_responses",
-        con=db.engine,
-        if_exists="append",
-        index=False,
+# Watermark of the last search_responses id processed by extractDocuments
+EXTRACT_DOCUMENTS_STAGE: str = "extract_documents"
+
+
+def _isUnextracted(db: DB, lowID: int, highID: int) -> ColumnElement[bool]:
+    """
+    200 responses with lowID < id <= highID whose DOIs were not captured
+    when they were crawled
+    """
+    responses: Table = db.table(name="search_responses")
+    results: Table = db.table(name="search_results")
+
+    return (
+        (responses.c.status_code == 200)
+        & (responses.c.id > lowID)
+        & (responses.c.id <= highID)
+        & ~exists().where(results.c.response_id == responses.c.id)
     )
 
 
-def extractDocuments(fp: Path) -> None:
-    NATURE_DOI: str = "10.1038/"
-    dfs: List[DataFrame] = []
+def _extractShard(
+    fp: Path,
+    lowID: int,
+    highID: int,
+    chunksize: int = 1000,
+) -> Tuple[int, array, List[str]]:
+    """
+    Parse the 200 responses with lowID < id <= highID that have no search
+    results yet, returning the number of responses parsed and the (response
+    id, DOI) pairs found as two arrays. Runs in worker processes, so it opens
+    its own connection.
+    """
+    responseIDs: array = array("q")
+    dois: List[str] = []
+    count: int = 0
 
     db: DB = DB(fp=fp)
 
-    respDF: DataFrame = db.readTableToDF(table="search_responses")
+    journalKeyMap: Series = db.keyMap(dimension="journal")
+    journalNames: dict[int, str] = dict(
+        zip(journalKeyMap.to_numpy(), journalKeyMap.index)
+    )
+
+    # Only the columns needed are streamed in chunks so that memory stays
+    # flat regardless of how large the shard is
+    respDF: DataFrame
+    for respDF in db.readTableToDF(
+        table="search_responses",
+        columns=["journal", "html"],
+        where=_isUnextracted(db=db, lowID=lowID, highID=highID),
+        chunksize=chunksize,
+    ):
+        idx: int
+        journal: int
+        html: str
+        for idx, journal, html in zip(
+            respDF.index,
+            respDF["journal"],
+            respDF["html"],
+        ):
+            doi: str
+            for doi in _extractDOIs(journal=journalNames[journal], html=html):
+                responseIDs.append(idx)
+                dois.append(doi)
+
+        count += respDF.shape[0]
+
+    db.engine.dispose()
+
+    return (count, responseIDs, dois)
+
+
+def extractDocuments(fp: Path, workers: int = 1, shards: int = 0) -> None:
+    """
+    Extract the DOIs listed in search responses stored since the last run.
+
+    Journals that capture DOIs at crawl time write their search results with
+    each page, so only the pages stored without them (by older crawls, or
+    those whose DOIs could not be read) are parsed here. The id range of
+    the new responses is split into shards (by default four per worker)
+    that are parsed by a pool of worker processes and merged here.
+    """
+    db: DB = DB(fp=fp)
+    db.createTables()
+
+    # Without a watermark every response is considered; those that already
+    # have search results are skipped by _isUnextracted
+    lastID: int = db.readWatermark(stage=EXTRACT_DOCUMENTS_STAGE) or 0
+
+    # Responses stored while this runs are left for the next run
+    highWatermark: int = max(lastID, db.maxValue(table="search_responses"))
+
+    isNew: ColumnElement[bool] = _isUnextracted(
+        db=db,
+        lowID=lastID,
+        highID=highWatermark,
+    )
+
+    bounds: List[int] = sorted(
+        set(
+            numpy.linspace(
+                start=lastID,
+                stop=highWatermark,
+                num=(shards if shards > 0 else workers * 4) + 1,
+                dtype=int,
+            ).tolist()
+        )
+    )
+    shardRanges: List[Tuple[int, int]] = list(zip(bounds[:-1], bounds[1:]))
 
-    row: Series
+    responseIDs: array = array("q")
+    dois: List[str] = []
+
+    count: int
+    shardIDs: array
+    shardDOIs: List[str]
     with Bar(
         "Extracting documents from search responses...",
-        max=respDF.shape[0],
+        max=db.countRows(table="search_responses", where=isNew),
     ) as bar:
-        for idx, row in respDF.iterrows():
-            data: defaultdict[str, List[str | int]] = defaultdict(list)
-            match row["journal"]:
-                case 0:
-                    soup: BeautifulSoup = BeautifulSoup(
-                        markup=row["html"],
-                        features="lxml",
-                    )
-                    tags: ResultSet[Tag] = soup.find_all(
-                        name="a",
-                        attrs={"class": "c-card__link"},
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures: List[Future] = [
+                    executor.submit(
+                        _extractShard,
+                        fp=fp,
+                        lowID=lowID,
+                        highID=highID,
                     )
+                    for lowID, highID in shardRanges
+                ]
+
+                future: Future
+                for future in as_completed(fs=futures):
+                    count, shardIDs, shardDOIs = future.result()
+                    responseIDs.extend(shardIDs)
+                    dois.extend(shardDOIs)
+                    bar.next(n=count)
+        else:
+            lowID: int
+            highID: int
+            for lowID, highID in shardRanges:
+                count, shardIDs, shardDOIs = _extractShard(
+                    fp=fp,
+                    lowID=lowID,
+                    highID=highID,
+                )
+                responseIDs.extend(shardIDs)
+                dois.extend(shardDOIs)
+                bar.next(n=count)
+
+    # Shards complete in any order; pairs are deduplicated before writing
+    searchResultsDF: DataFrame = DataFrame(
+        data={
+            "document_id": dois,
+            "response_id": numpy.frombuffer(responseIDs, dtype=numpy.int64),
+        },
+        columns=["document_id", "response_id"],
+    ).drop_duplicates(ignore_index=True)
+
+    db.writeSearchResults(
+        data=searchResultsDF,
+        stage=EXTRACT_DOCUMENTS_STAGE,
+        watermark=highWatermark,
+    )
 
-                    tag: Tag
-                    for tag in tags:
-                        url: str = tag.get(key="href")
-                        doi: str = NATURE_DOI + url.split("/")[-1]
-                        data["document_id"].append(doi)
-                        data["response_id"].append(idx)
-                case 1:
-                    json: dict[str, Any] = loads(row["html"])
-                    docs: List[dict[str, Any]] = json["searchResults"]["docs"]
-
-                    doc: dict[str, Any]
-                    for doc in docs:
-                        doi: str = doc["id"]
-                        data["document_id"].append(doi)
-                        data["response_id"].append(idx)
-                case _:
-                    return None
-            dfs.append(DataFrame(data=data))
-            bar.next()
 
-    searchResultsDF: DataFrame = pandas.concat(objs=dfs, ignore_index=True)
+def _writeOpenAlexResponse(
+    idx: int,
+    url: str,
+    resp: Response | None,
+    db: DB,
+    documentIDs: Series,
+    batches: List[List[str]],
+    bar: Bar,
+    archive: bool = False,
+) -> None:
+    bar.next()
 
-    documentsDF: DataFrame = DataFrame(
-        data=searchResultsDF["document_id"].unique(),
-        columns=["doi"],
-    )
+    if resp is None or resp.status_code != 200:
+        statusCode: int = (
+            TIMEOUT_STATUS_CODE if resp is None else resp.status_code
+        )
+        print(statusCode)
+
+        # Failed batches are recorded per document, as failed search pages
+        # are, so that aius openalex --retry-failed can refetch them
+        failedIDs: List[int] = [
+            int(documentIDs[doi.lower()]) for doi in batches[idx]
+        ]
+        _writeOpenAlexRows(
+            rows=WorkRows(),
+            data={
+                "document_id": failedIDs,
+                "url": [url] * len(failedIDs),
+                "status_code": [statusCode] * len(failedIDs),
+                "html": [""] * len(failedIDs),
+            },
+            db=db,
+        )
+        return None
 
-    _mapDFIndexToDFValue(
-        df1=documentsDF,
-        df2=searchResultsDF,
-        c1="doi",
-        c2="document_id",
-    )
+    rows: WorkRows = WorkRows()
+    data: defaultdict[str, List[str | int]] = defaultdict(list)
 
-    documentsDF.to_sql(
-        name="documents",
-        con=db.engine,
-        if_exists="append",
-        index=False,
-    )
-    searchResultsDF.to_sql(
-        name="search_results",
-        con=db.engine,
-        if_exists="append",
-        index=False,
-    )
+    document: dict
+    for document in iterWorks(payload=resp.content):
+        # OpenAlex lowercases DOIs
+        documentID: int | None = documentIDs.get(
+            document["doi"].replace(DOI_URL, "").lower()
+        )
+
+        if documentID is None:
+            continue
+
+        rows.append(documentID=documentID, work=document)
+
+        if archive:
+            data["document_id"].append(documentID)
+            data["url"].append(url)
+            data["status_code"].append(resp.status_code)
+            data["html"].append(dumpBytes(obj=document))
+
+    _writeOpenAlexRows(rows=rows, data=data, db=db)
+
+
+def _writeOpenAlexRows(
+    rows: WorkRows,
+    data: dict[str, List[str | int]],
+    db: DB,
+) -> None:
+    works, topics = rows.toDataFrames()
+    db.writeWorks(works=works, topics=topics)
+
+    # The raw JSON is only kept when archiving was requested
+    oaResponsesDF: DataFrame = DataFrame(data=data)
+
+    if oaResponsesDF.shape[0] == 0:
+        return None
+
+    db.storePayloadColumn(df=oaResponsesDF)
 
+    db.bulkInsert(table="openalex_responses", data=oaResponsesDF)
 
-def getOpenAlexMetadata(fp: Path, email: str, doiCount: int = 25) -> None:
-    DOI_URL: str = "https://doi.org/"
-    dfs: List[DataFrame] = []
 
+def getOpenAlexMetadata(
+    fp: Path,
+    email: str,
+    doiCount: int = MAX_DOI_BATCH_SIZE,
+    concurrency: int = 8,
+    archive: bool = False,
+    retryFailed: bool = False,
+) -> None:
     db: DB = DB(fp=fp)
+    db.createTables()
 
-    documentDF: DataFrame = db.readTableToDF(table="documents")
+    documentIDs: Series = db.keyMap(dimension="doi")
+    dois: List[str] = (
+        db.readFailedOpenAlexDOIs()
+        if retryFailed
+        else documentIDs.index.to_list()
+    )
+    documentIDs.index = documentIDs.index.str.lower()
 
-    documentDF["doi_url"] = documentDF["doi"].apply(lambda x: DOI_URL + x)
+    batches: List[List[str]] = [
+        dois[idx : idx + doiCount]  # noqa: E203
+        for idx in range(0, len(dois), doiCount)
+    ]
 
-    idx: int
+    # Batches are parsed into works and work_topics as soon as they complete
     with Bar(
-        "Getting document metadata from PLOS...",
-        max=ceil(documentDF.shape[0] / 25),
+        "Getting document metadata from OpenAlex...",
+        max=len(batches),
     ) as bar:
-        for idx in range(0, documentDF.shape[0], doiCount):
-            data: defaultdict[str, List[str | int]] = defaultdict(list)
+        AsyncOpenAlexClient(email=email, concurrency=concurrency).run(
+            batches=batches,
+            onBatch=partial(
+                _writeOpenAlexResponse,
+                db=db,
+                documentIDs=documentIDs,
+                batches=batches,
+                bar=bar,
+                archive=archive,
+            ),
+        )
 
-            _df: DataFrame = documentDF.iloc[
-                idx : idx + doiCount  # noqa: E203
+
+def getOpenAlexSnapshotMetadata(
+    fp: Path,
+    snapshot: Path,
+    batchSize: int = 1000,
+    archive: bool = False,
+) -> None:
+    db: DB = DB(fp=fp)
+    db.createTables()
+
+    documentIDs: Series = db.keyMap(dimension="doi")
+    documentIDs.index = documentIDs.index.str.lower()
+
+    rows: WorkRows = WorkRows()
+    data: defaultdict[str, List[str | int]] = defaultdict(list)
+
+    partition: Path
+    work: dict
+    with Bar(
+        "Getting document metadata from the OpenAlex snapshot...",
+        max=len(documentIDs),
+    ) as bar:
+        for partition, work in iterSnapshotWorks(
+            directory=snapshot,
+            dois=set(documentIDs.index),
+        ):
+            documentID: int = documentIDs[
+                work["doi"].replace(DOI_URL, "").lower()
             ]
-            dois: str = "|".join(_df["doi_url"].to_list())
-            url: str = (
-                "https://api.openalex.org/works?mailto="
-                + email
-                + "&filter=doi:"
-                + dois
-            )
-            resp: Response = get(url=url, timeout=60)
-
-            if resp.status_code != 200:
-                print(resp.status_code)
-                data["document_id"].append("")
-                data["url"].append(url)
-                data["status_code"].append(resp.status_code)
-                data["html"].append("")
-                bar.next()
-                continue
-
-            document: dict
-            for document in resp.json()["results"]:
-                data["document_id"].append(
-                    document["doi"].replace(DOI_URL, "")
-                )
-                data["url"].append(url)
-                data["status_code"].append(resp.status_code)
-                data["html"].append(dumps(obj=document))
+            rows.append(documentID=documentID, work=work)
+
+            if archive:
+                data["document_id"].append(documentID)
+                data["url"].append(partition.as_uri())
+                data["status_code"].append(200)
+                data["html"].append(dumpBytes(obj=work))
 
-            dfs.append(DataFrame(data=data))
             bar.next()
 
-    oaResponsesDF: DataFrame = pandas.concat(objs=dfs, ignore_index=True)
+            if len(rows) >= batchSize:
+                _writeOpenAlexRows(rows=rows, data=data, db=db)
+                rows = WorkRows()
+                data = defaultdict(list)
+
+    if len(rows) > 0:
+        _writeOpenAlexRows(rows=rows, data=data, db=db)
 
-    _mapDFIndexToDFValue(
-        df1=documentDF,
-        df2=oaResponsesDF,
-        c1="doi",
-        c2="document_id",
+
+def exportDB(fp: Path, directory: Path, rowGroupSize: int) -> None:
+    dataset.exportDB(
+        db=DB(fp=fp),
+        directory=directory,
+        rowGroupSize=rowGroupSize,
     )
 
-    oaResponsesDF.to_sql(
-        name="openalex_responses",
-        con=db.engine,
-        if_exists="append",
-        index=False,
+
+def importDB(fp: Path, directory: Path) -> None:
+    dataset.importDB(db=initialize(fp=fp), directory=directory)
+
+
+def countKeywords(fp: Path, outputFP: Path, near: int | None) -> None:
+    ifFileExistsExit(fps=[outputFP])
+
+    index: PaperIndex = PaperIndex(db=DB(fp=fp))
+    keywords: List[str] = [
+        keyword.strip('"') for keyword in SEARCH_KEYWORDS["keyword"]
+    ]
+
+    df: DataFrame = (
+        index.phraseCounts(phrases=keywords)
+        if near is None
+        else index.nearCounts(phrases=keywords, distance=near)
+    )
+    df.to_csv(path_or_buf=outputFP, index=False)
+
+
+def analyzeDB(fp: Path) -> None:
+    db: DB = DB(fp=fp)
+    db.createIndexes()
+
+    plans: DataFrame = db.analyze()
+
+    query: str
+    plan: DataFrame
+    for query, plan in plans.groupby(by="query", sort=False):
+        print(f"{query}\n===")
+        detail: str
+        fullScan: bool
+        for detail, fullScan in zip(plan["detail"], plan["full_scan"]):
+            print(f"{'SLOW ' if fullScan else '     '}{detail}")
+        print()
+
+
+def _responseCache(
+    args: dict[str, Any],
+    command: str,
+) -> ResponseCache | None:
+    if args[f"{command}.no_cache"]:
+        return None
+
+    return ResponseCache(
+        directory=args[f"{command}.cache_dir"][0],
+        ttl=args[f"{command}.cache_ttl"][0] * 60 * 60,
     )
 
 
@@ -328,12 +904,80 @@ def main() -> None:
     match arg:
         case "init":
             initialize(fp=args["init.db"][0])
+        case "db":
+            match args["db.action"][0]:
+                case "analyze":
+                    analyzeDB(fp=args["db.db"][0])
+                case "migrate":
+                    DB(fp=args["db.db"][0]).migratePayloads()
+        case "export":
+            exportDB(
+                fp=args["export.db"][0],
+                directory=args["export.output"][0],
+                rowGroupSize=args["export.row_group_size"][0],
+            )
+        case "fts":
+            match args["fts.action"][0]:
+                case "index":
+                    PaperIndex(db=DB(fp=args["fts.db"][0])).indexParquet(
+                        fp=args["fts.input"][0]
+                    )
+                case "count":
+                    countKeywords(
+                        fp=args["fts.db"][0],
+                        outputFP=args["fts.output"][0],
+                        near=args["fts.near"][0],
+                    )
+                case "query":
+                    print(
+                        PaperIndex(db=DB(fp=args["fts.db"][0]))
+                        .search(query=args["fts.query"][0])
+                        .to_string(index=False)
+                    )
+        case "import":
+            importDB(
+                fp=args["import.db"][0],
+                directory=args["import.input"][0],
+            )
         case "search":
-            search(fp=args["search.db"][0], journal=args["search.journal"][0])
+            configureSharedSearch(
+                poolSize=args["search.pool_size"][0],
+                cache=_responseCache(args=args, command="search"),
+            )
+            search(
+                fp=args["search.db"][0],
+                journal=args["search.journal"][0],
+                pageWorkers=args["search.page_workers"][0],
+                workers=args["search.workers"][0],
+                workersPerJournal=args["search.workers_per_journal"][0],
+                resume=args["search.resume"],
+            )
         case "ed":
-            extractDocuments(fp=args["ed.db"][0])
+            extractDocuments(
+                fp=args["ed.db"][0],
+                workers=args["ed.workers"][0],
+            )
         case "oa":
-            getOpenAlexMetadata(fp=args["oa.db"][0], email=args["oa.email"][0])
+            if args["oa.snapshot"] is not None:
+                getOpenAlexSnapshotMetadata(
+                    fp=args["oa.db"][0],
+                    snapshot=args["oa.snapshot"][0],
+                    archive=args["oa.archive_json"],
+                )
+                sys.exit(0)
+
+            configureSharedSearch(
+                poolSize=args["oa.pool_size"][0],
+                cache=_responseCache(args=args, command="oa"),
+            )
+            getOpenAlexMetadata(
+                fp=args["oa.db"][0],
+                email=args["oa.email"][0],
+                doiCount=args["oa.batch_size"][0],
+                concurrency=args["oa.concurrency"][0],
+                archive=args["oa.archive_json"],
+                retryFailed=args["oa.retry_failed"],
+            )
 
     sys.exit(0)
 
@@ -0,0 +1,53 @@
+from typing import List
+from urllib.parse import urlencode
+
+OPENALEX_WORKS_URL: str = "https://api.openalex.org/works"
+
+DOI_URL: str = "https://doi.org/"
+
+# OpenAlex accepts at most 100 values in a single OR filter and returns at
+# most 200 results per page
+MAX_DOI_BATCH_SIZE: int = 100
+
+# Only the fields read by later stages are requested:
+#   doi               joins works back to the documents table
+#   cited_by_count    citation filter (2_filterDocs, filterDocuments)
+#   topics            field filter (2_filterDocs, filterDocuments) and topic
+#                     analysis (scripts/oaTopicAnalysis.py)
+#   publication_date  per year sampling (sampleDocuments)
+SELECT_FIELDS: List[str] = [
+    "id",
+    "doi",
+    "cited_by_count",
+    "topics",
+    "publication_date",
+]
+
+
+def worksURL(
+    dois: List[str],
+    email: str,
+    select: List[str] = SELECT_FIELDS,
+) -> str:
+    """
+    Build a single works query for a batch of DOIs, returning every match on
+    one page and only the selected fields
+    """
+    if len(dois) > MAX_DOI_BATCH_SIZE:
+        raise ValueError(
+            f"OpenAlex accepts at most {MAX_DOI_BATCH_SIZE} DOIs per query"
+        )
+
+    params: dict[str, str | int] = {
+        "filter": "doi:"
+        + "|".join(
+            [doi if doi.startswith(DOI_URL) else DOI_URL + doi for doi in dois]
+        ),
+        "per_page": len(dois),
+        "mailto": email,
+    }
+
+    if len(select) > 0:
+        params["select"] = ",".join(select)
+
+    return OPENALEX_WORKS_URL + "?" + urlencode(query=params, safe=":/|,@")
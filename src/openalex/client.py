@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+from requests import Response
+
+from src.openalex import worksURL
+from src.search import Search, sharedSearch
+
+# Called with the batch index, the request URL, and the response (None on
+# timeout) as each batch completes
+BatchCallback = Callable[[int, str, Response | None], None]
+
+
+class AsyncOpenAlexClient:
+    """
+    Query OpenAlex with up to concurrency DOI batches in flight.
+
+    Requests go through a Search instance, so the pooled session, per-host
+    rate limiter, and response cache apply to every batch. The email is sent
+    as mailto on every request to stay in the OpenAlex polite pool.
+    """
+
+    def __init__(
+        self,
+        email: str,
+        concurrency: int = 8,
+        search: Search | None = None,
+    ) -> None:
+        if not email:
+            raise ValueError("An email is required for the polite pool")
+
+        self.email: str = email
+        self.concurrency: int = concurrency
+        self.search: Search = search if search is not None else sharedSearch()
+
+    async def _fetch(
+        self,
+        idx: int,
+        dois: List[str],
+        semaphore: asyncio.Semaphore,
+        executor: ThreadPoolExecutor,
+    ) -> Tuple[int, str, Response | None]:
+        url: str = worksURL(dois=dois, email=self.email)
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        async with semaphore:
+            resp: Response | None = await loop.run_in_executor(
+                executor,
+                self.search.search,
+                url,
+            )
+
+        return (idx, url, resp)
+
+    async def _run(
+        self,
+        batches: List[List[str]],
+        onBatch: BatchCallback,
+    ) -> None:
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(
+            value=self.concurrency
+        )
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            tasks: List[asyncio.Task] = [
+                asyncio.create_task(
+                    self._fetch(
+                        idx=idx,
+                        dois=dois,
+                        semaphore=semaphore,
+                        executor=executor,
+                    )
+                )
+                for idx, dois in enumerate(batches)
+            ]
+
+            task: asyncio.Future
+            for task in asyncio.as_completed(tasks):
+                onBatch(*(await task))
+
+    def run(self, batches: List[List[str]], onBatch: BatchCallback) -> None:
+        """
+        Fetch every batch, calling onBatch in completion order
+        """
+        asyncio.run(self._run(batches=batches, onBatch=onBatch))
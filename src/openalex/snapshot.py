@@ -0,0 +1,70 @@
+import gzip
+import re
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from src.openalex import DOI_URL, SELECT_FIELDS
+from src.utils import loads
+
+# Cheap pre-filter so that only lines mentioning a wanted DOI are parsed
+DOI_PATTERN: re.Pattern[bytes] = re.compile(
+    rb'"doi":\s*"' + re.escape(DOI_URL.encode()) + rb'([^"]+)"'
+)
+
+
+def iterSnapshotPartitions(directory: Path) -> Iterator[Path]:
+    """
+    Yield the gzipped JSON Lines partitions of an OpenAlex works snapshot
+    (e.g. data/works/updated_date=YYYY-MM-DD/part_000.gz) in a stable order
+    """
+    yield from sorted(directory.rglob("*.gz"))
+
+
+def iterSnapshotWorks(
+    directory: Path,
+    dois: set[str],
+    select: List[str] = SELECT_FIELDS,
+) -> Iterator[Tuple[Path, dict]]:
+    """
+    Stream the works of a snapshot whose DOI is in dois, one line at a time.
+
+    dois must be lowercase and without the https://doi.org/ prefix. Matched
+    DOIs are removed from a copy of the set so that the scan stops once every
+    DOI has been found. Works are projected to the select fields so that rows
+    match those returned by the API.
+    """
+    pending: set[str] = set(dois)
+
+    fp: Path
+    for fp in iterSnapshotPartitions(directory=directory):
+        with gzip.open(filename=fp, mode="rb") as partition:
+            line: bytes
+            for line in partition:
+                candidates: set[str] = {
+                    match.decode(errors="ignore").lower()
+                    for match in DOI_PATTERN.findall(line)
+                }
+
+                if pending.isdisjoint(candidates):
+                    continue
+
+                work: dict = loads(s=line)
+                doi: str | None = work.get("doi")
+
+                if doi is None:
+                    continue
+
+                doi = doi.replace(DOI_URL, "").lower()
+
+                if doi not in pending:
+                    continue
+
+                pending.remove(doi)
+
+                if len(select) > 0:
+                    work = {field: work.get(field) for field in select}
+
+                yield (fp, work)
+
+                if len(pending) == 0:
+                    return None
@@ -0,0 +1,151 @@
+from collections import defaultdict
+from io import BytesIO
+from typing import Any, BinaryIO, Iterator, List, Tuple
+
+import ijson
+from ijson.common import ObjectBuilder
+from pandas import DataFrame
+
+from src.openalex import SELECT_FIELDS
+
+# ijson prefix of the works in a list response ({"results": [...], ...})
+RESULTS_PREFIX: str = "results.item"
+
+# Columns of the works and work_topics tables filled from a work
+WORK_COLUMNS: List[str] = [
+    "document_id",
+    "openalex_id",
+    "cited_by_count",
+    "publication_date",
+    "publication_year",
+]
+WORK_TOPIC_COLUMNS: List[str] = [
+    "document_id",
+    "rank",
+    "topic_id",
+    "topic",
+    "score",
+    "subfield",
+    "field",
+    "domain",
+]
+
+
+def _iterWorkEvents(
+    fp: BinaryIO,
+    fields: List[str],
+) -> Iterator[dict]:
+    """
+    Build each work from the parse events of its wanted fields only; the
+    events of every other field are dropped as they are read
+    """
+    work: dict | None = None
+    key: str | None = None
+    builder: ObjectBuilder | None = None
+    depth: int = 0
+
+    prefix: str
+    event: str
+    value: Any
+    for prefix, event, value in ijson.parse(fp, use_float=True):
+        if prefix == RESULTS_PREFIX:
+            match event:
+                case "start_map":
+                    work = {}
+                case "end_map":
+                    yield work
+                    work = None
+                case "map_key":
+                    key = value if value in fields else None
+            continue
+
+        if work is None or key is None:
+            continue
+
+        if builder is None:
+            builder = ObjectBuilder()
+
+        builder.event(event, value)
+
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+
+        if depth == 0:
+            work[key] = builder.value
+            key = None
+            builder = None
+
+
+def iterWorks(
+    payload: bytes | str | BinaryIO,
+    fields: List[str] | None = SELECT_FIELDS,
+) -> Iterator[dict]:
+    """
+    Yield the works of an OpenAlex list response one at a time, projected to
+    fields (every field when None).
+
+    The response is parsed incrementally with ijson, so only the work being
+    built is held in memory regardless of the batch size.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode()
+
+    fp: BinaryIO = BytesIO(payload) if isinstance(payload, bytes) else payload
+
+    if fields is None:
+        yield from ijson.items(fp, RESULTS_PREFIX, use_float=True)
+    else:
+        yield from _iterWorkEvents(fp=fp, fields=fields)
+
+
+def _displayName(topic: dict, level: str) -> str | None:
+    value: dict | None = topic.get(level)
+    return None if value is None else value.get("display_name")
+
+
+class WorkRows:
+    """
+    Column buffers for the works and work_topics tables.
+
+    Each OpenAlex work is parsed once as it is ingested, so reports over
+    works and topics (Analytics.worksPerField, Analytics.topicLevelCounts)
+    query typed columns instead of decoding stored JSON.
+    """
+
+    def __init__(self) -> None:
+        self.works: defaultdict[str, List[Any]] = defaultdict(list)
+        self.topics: defaultdict[str, List[Any]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self.works["document_id"])
+
+    def toDataFrames(self) -> Tuple[DataFrame, DataFrame]:
+        return (
+            DataFrame(data=self.works, columns=WORK_COLUMNS),
+            DataFrame(data=self.topics, columns=WORK_TOPIC_COLUMNS),
+        )
+
+    def append(self, documentID: int, work: dict) -> None:
+        publicationDate: str | None = work.get("publication_date")
+
+        self.works["document_id"].append(documentID)
+        self.works["openalex_id"].append(work.get("id"))
+        self.works["cited_by_count"].append(work.get("cited_by_count"))
+        self.works["publication_date"].append(publicationDate)
+        self.works["publication_year"].append(
+            None if not publicationDate else int(publicationDate[:4])
+        )
+
+        rank: int
+        topic: dict
+        for rank, topic in enumerate(work.get("topics") or []):
+            self.topics["document_id"].append(documentID)
+            self.topics["rank"].append(rank)
+            self.topics["topic_id"].append(topic.get("id"))
+            self.topics["topic"].append(topic.get("display_name"))
+            self.topics["score"].append(topic.get("score"))
+            self.topics["subfield"].append(_displayName(topic, "subfield"))
+            self.topics["field"].append(_displayName(topic, "field"))
+            self.topics["domain"].append(_displayName(topic, "domain"))
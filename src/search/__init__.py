@@ -1,8 +1,18 @@
-from typing import List, Type
+from typing import Any, Callable, List, Type
 
-from requests import Response, get
-from requests.exceptions import ReadTimeout
+from pandas import DataFrame
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
 from typedframe import TypedDataFrame
+from urllib3.util.retry import Retry
+
+from src.search.cache import CacheEntry, ResponseCache
+from src.search.ratelimit import (
+    BACKOFF_STATUS_CODES,
+    RateLimiter,
+    sharedRateLimiter,
+)
 
 SEARCH_RESULTS_STOR: dict[str, List[str | int | bytes]] = {
     "year": [],
@@ -14,6 +24,11 @@ SEARCH_RESULTS_STOR: dict[str, List[str | int | bytes]] = {
     "journal": [],
 }
 
+# Status code recorded for pages whose request timed out
+TIMEOUT_STATUS_CODE: int = 408
+
+SearchPageCallback = Callable[[dict[str, Any]], None]
+
 
 class SearchResultDataFrameSchema(TypedDataFrame):
     schema: dict[str, Type] = {
@@ -27,23 +42,185 @@ class SearchResultDataFrameSchema(TypedDataFrame):
     }
 
 
+def searchResultsDF(data: dict[str, list]) -> DataFrame:
+    """
+    Build and validate a search results DataFrame, even when no pages were
+    fetched
+    """
+    df: DataFrame = DataFrame(
+        data=data,
+        columns=list(SEARCH_RESULTS_STOR),
+    ).astype(dtype={"year": int, "page": int, "status_code": int})
+
+    SearchResultDataFrameSchema(df=df)
+
+    return df
+
+
+def searchResultRow(
+    year: int,
+    query: str,
+    page: int,
+    url: str,
+    resp: Response | None,
+    journal: str,
+    dois: List[str] | None = None,
+) -> dict[str, Any]:
+    """
+    A fetched search page. dois are the documents listed on the page when
+    the journal extracted them while the response was in memory; they are
+    written to search_results by the onPage writer and are not part of
+    searchResultsDF
+    """
+    return {
+        "year": year,
+        "query": query,
+        "page": page,
+        "url": url,
+        "status_code": (
+            TIMEOUT_STATUS_CODE if resp is None else resp.status_code
+        ),
+        "html": "" if resp is None else resp.content.decode(errors="ignore"),
+        "journal": journal,
+        "dois": dois,
+    }
+
+
 class Search:
     def __init__(
         self,
         headers: dict[str, str] = {
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0",  # noqa: E501,
         },
+        poolSize: int = 16,
+        retries: int = 3,
+        backoffFactor: float = 0.5,
+        rateLimiter: RateLimiter | None = None,
+        maxThrottledRetries: int = 5,
+        cache: ResponseCache | None = None,
     ) -> None:
         self.headers: dict[str, str] = headers
+        self.cache: ResponseCache | None = cache
+        self.rateLimiter: RateLimiter = (
+            rateLimiter if rateLimiter is not None else sharedRateLimiter()
+        )
+        self.maxThrottledRetries: int = maxThrottledRetries
+
+        # One connection pool per host; connections are kept alive and
+        # reused across every search made through this instance. 429 and 503
+        # responses are left to the rate limiter so Retry-After is honored
+        # per host rather than per request. Once retries run out the last
+        # response is returned so its status code is recorded
+        retry: Retry = Retry(
+            total=retries,
+            backoff_factor=backoffFactor,
+            status_forcelist=[500, 502, 504],
+            allowed_methods=["GET"],
+            raise_on_status=False,
+        )
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=poolSize,
+            pool_maxsize=poolSize,
+            max_retries=retry,
+        )
+
+        self.session: Session = Session()
+        self.session.headers.update(self.headers)
+        self.session.mount(prefix="https://", adapter=adapter)
+        self.session.mount(prefix="http://", adapter=adapter)
 
     def search(self, url: str) -> Response | None:
-        try:
-            resp: Response = get(
-                url=url,
-                headers=self.headers,
-                timeout=60,
-                allow_redirects=True,
-            )
-        except ReadTimeout:
+        if self.cache is None:
+            return self._get(url=url)
+
+        entry: CacheEntry | None = self.cache.lookup(
+            url=url,
+            headers=self.headers,
+        )
+
+        if entry is not None and self.cache.isFresh(entry=entry):
+            return entry.toResponse()
+
+        resp: Response | None = self._get(
+            url=url,
+            headers={} if entry is None else entry.conditionalHeaders(),
+        )
+
+        if resp is None:
             return None
+
+        if resp.status_code == 304 and entry is not None:
+            self.cache.revalidate(entry=entry)
+            return entry.toResponse()
+
+        if resp.status_code == 200:
+            self.cache.store(url=url, headers=self.headers, resp=resp)
+
+        return resp
+
+    def _get(
+        self,
+        url: str,
+        headers: dict[str, str] = {},
+    ) -> Response | None:
+        resp: Response | None = None
+
+        attempt: int
+        for attempt in range(self.maxThrottledRetries + 1):
+            self.rateLimiter.acquire(url=url)
+
+            try:
+                resp = self.session.get(
+                    url=url,
+                    headers=headers,
+                    timeout=60,
+                    allow_redirects=True,
+                )
+            except RequestException:
+                # Timeouts, connection errors, and exhausted retries are
+                # recorded like a timeout rather than ending the crawl
+                resp = None
+
+            self.rateLimiter.record(url=url, resp=resp)
+
+            if resp is None or resp.status_code not in BACKOFF_STATUS_CODES:
+                break
+
         return resp
+
+    def close(self) -> None:
+        self.session.close()
+
+        if self.cache is not None:
+            self.cache.close()
+
+
+_SHARED_SEARCH: Search | None = None
+
+
+def sharedSearch() -> Search:
+    """
+    Return the process wide Search instance so that every journal class and
+    OpenAlex query reuses the same pooled, keep-alive session
+    """
+    global _SHARED_SEARCH
+
+    if _SHARED_SEARCH is None:
+        _SHARED_SEARCH = Search()
+
+    return _SHARED_SEARCH
+
+
+def configureSharedSearch(**kwargs) -> Search:
+    """
+    Replace the process wide Search instance with one built from kwargs
+    (e.g. poolSize, retries)
+    """
+    global _SHARED_SEARCH
+
+    if _SHARED_SEARCH is not None:
+        _SHARED_SEARCH.close()
+
+    _SHARED_SEARCH = Search(**kwargs)
+
+    return _SHARED_SEARCH
@@ -0,0 +1,223 @@
+import sqlite3
+from dataclasses import dataclass
+from hashlib import sha256
+from json import dumps, loads
+from pathlib import Path
+from threading import Lock
+from time import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+def normalizeURL(url: str) -> str:
+    """
+    Lowercase the scheme and host, sort the query parameters, and drop the
+    fragment so equivalent URLs share a cache entry
+    """
+    parts = urlsplit(url=url)
+    query: str = urlencode(
+        query=sorted(parse_qsl(qs=parts.query, keep_blank_values=True))
+    )
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path or "/",
+            query,
+            "",
+        )
+    )
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    url: str
+    statusCode: int
+    headers: dict[str, str]
+    content: bytes
+    storedAt: float
+    etag: str | None
+    lastModified: str | None
+
+    def toResponse(self) -> Response:
+        resp: Response = Response()
+        resp.status_code = self.statusCode
+        resp.url = self.url
+        resp.headers = CaseInsensitiveDict(data=self.headers)
+        resp.encoding = get_encoding_from_headers(headers=resp.headers)
+        resp._content = self.content
+        return resp
+
+    def conditionalHeaders(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+
+        if self.lastModified is not None:
+            headers["If-Modified-Since"] = self.lastModified
+
+        return headers
+
+
+class ResponseCache:
+    """
+    On-disk cache of successful HTTP responses.
+
+    Entries are keyed by the normalized URL and request headers. Entries
+    younger than ttl seconds are served without touching the network; older
+    entries are revalidated with If-None-Match/If-Modified-Since. When the
+    stored bodies exceed maxBytes the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl: float = 7 * 24 * 60 * 60,
+        maxBytes: int = 8 * 1024**3,
+    ) -> None:
+        self.directory: Path = directory
+        self.ttl: float = ttl
+        self.maxBytes: int = maxBytes
+        self.lock: Lock = Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.conn: sqlite3.Connection = sqlite3.connect(
+            database=self.directory / "responses.sqlite3",
+            check_same_thread=False,
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+            "ON responses (accessed_at)"
+        )
+        self.conn.commit()
+
+    def key(self, url: str, headers: dict[str, str]) -> str:
+        normalizedHeaders: list[tuple[str, str]] = sorted(
+            (name.lower(), value) for name, value in headers.items()
+        )
+        return sha256(
+            dumps(obj=[normalizeURL(url=url), normalizedHeaders]).encode()
+        ).hexdigest()
+
+    def isFresh(self, entry: CacheEntry) -> bool:
+        return time() - entry.storedAt < self.ttl
+
+    def lookup(self, url: str, headers: dict[str, str]) -> CacheEntry | None:
+        key: str = self.key(url=url, headers=headers)
+
+        with self.lock:
+            row: tuple | None = self.conn.execute(
+                "SELECT url, status_code, headers, content, stored_at, etag, "
+                "last_modified FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self.conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (time(), key),
+            )
+            self.conn.commit()
+
+        return CacheEntry(
+            key=key,
+            url=row[0],
+            statusCode=row[1],
+            headers=loads(s=row[2]),
+            content=row[3],
+            storedAt=row[4],
+            etag=row[5],
+            lastModified=row[6],
+        )
+
+    def store(
+        self,
+        url: str,
+        headers: dict[str, str],
+        resp: Response,
+    ) -> None:
+        key: str = self.key(url=url, headers=headers)
+        now: float = time()
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    resp.url,
+                    resp.status_code,
+                    dumps(obj=dict(resp.headers)),
+                    resp.content,
+                    len(resp.content),
+                    now,
+                    now,
+                    resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"),
+                ),
+            )
+            self._evict()
+            self.conn.commit()
+
+    def revalidate(self, entry: CacheEntry) -> None:
+        """
+        Mark an entry as fresh again after a 304 Not Modified response
+        """
+        now: float = time()
+
+        with self.lock:
+            self.conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? "
+                "WHERE key = ?",
+                (now, now, entry.key),
+            )
+            self.conn.commit()
+
+        entry.storedAt = now
+
+    def _evict(self) -> None:
+        total: int = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+        if total <= self.maxBytes:
+            return
+
+        key: str
+        size: int
+        for key, size in self.conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.maxBytes:
+                break
+
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
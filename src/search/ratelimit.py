@@ -0,0 +1,160 @@
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from time import monotonic, sleep
+from urllib.parse import urlparse
+
+from requests import Response
+
+# Requests per second allowed to each host; OpenAlex allows 10 requests per
+# second in the polite pool
+HOST_RATES: dict[str, float] = {
+    "api.openalex.org": 10,
+    "journals.plos.org": 5,
+    "www.nature.com": 2,
+}
+
+BACKOFF_STATUS_CODES: set[int] = {429, 503}
+
+
+def parseRetryAfter(value: str | None) -> float | None:
+    """
+    Retry-After is either a number of seconds or an HTTP date
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        date: datetime = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return max((date - datetime.now(tz=timezone.utc)).total_seconds(), 0)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.maxRate: float = rate
+        self.rate: float = rate
+        self.capacity: float = (
+            capacity if capacity is not None else max(rate, 1)
+        )
+        self.tokens: float = self.capacity
+        self.lastRefill: float = monotonic()
+        self.blockedUntil: float = 0
+        self.lock: Lock = Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.lastRefill) * self.rate,
+        )
+        self.lastRefill = now
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now: float = monotonic()
+                self._refill(now=now)
+
+                if now < self.blockedUntil:
+                    wait: float = self.blockedUntil - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+
+            sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self.lock:
+            self.blockedUntil = max(self.blockedUntil, monotonic() + seconds)
+            self.tokens = 0
+
+    def scaleRate(self, factor: float, minRate: float) -> None:
+        with self.lock:
+            self._refill(now=monotonic())
+            self.rate = min(self.maxRate, max(minRate, self.rate * factor))
+
+
+class RateLimiter:
+    """
+    Per-host token buckets shared by every outbound request.
+
+    The rate of a host is halved on 429/503 responses (after waiting out any
+    Retry-After) or when the recent error rate exceeds errorThreshold, and
+    recovers slowly towards its configured rate while requests succeed.
+    """
+
+    def __init__(
+        self,
+        hostRates: dict[str, float] = HOST_RATES,
+        defaultRate: float = 5,
+        minRate: float = 0.25,
+        errorThreshold: float = 0.1,
+        window: int = 50,
+    ) -> None:
+        self.hostRates: dict[str, float] = hostRates
+        self.defaultRate: float = defaultRate
+        self.minRate: float = minRate
+        self.errorThreshold: float = errorThreshold
+        self.window: int = window
+
+        self.buckets: dict[str, TokenBucket] = {}
+        self.outcomes: dict[str, deque[bool]] = {}
+        self.lock: Lock = Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(
+                    rate=self.hostRates.get(host, self.defaultRate)
+                )
+                self.outcomes[host] = deque(maxlen=self.window)
+
+            return self.buckets[host]
+
+    def acquire(self, url: str) -> None:
+        self._bucket(host=urlparse(url=url).netloc).acquire()
+
+    def record(self, url: str, resp: Response | None) -> None:
+        host: str = urlparse(url=url).netloc
+        bucket: TokenBucket = self._bucket(host=host)
+
+        failed: bool = resp is None or resp.status_code >= 500
+        throttled: bool = (
+            resp is not None and resp.status_code in BACKOFF_STATUS_CODES
+        )
+
+        with self.lock:
+            outcomes: deque[bool] = self.outcomes[host]
+            outcomes.append(failed or throttled)
+            errorRate: float = sum(outcomes) / len(outcomes)
+
+        if throttled:
+            retryAfter: float | None = parseRetryAfter(
+                value=resp.headers.get("Retry-After")
+            )
+            bucket.pause(seconds=retryAfter if retryAfter else 1 / bucket.rate)
+
+        if throttled or (failed and errorRate > self.errorThreshold):
+            bucket.scaleRate(factor=0.5, minRate=self.minRate)
+        else:
+            bucket.scaleRate(factor=1.05, minRate=self.minRate)
+
+
+_SHARED_RATE_LIMITER: RateLimiter = RateLimiter()
+
+
+def sharedRateLimiter() -> RateLimiter:
+    return _SHARED_RATE_LIMITER
@@ -0,0 +1,109 @@
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from threading import BoundedSemaphore
+from typing import List, Tuple
+
+import pandas
+from pandas import DataFrame
+from progress.bar import Bar
+
+from src.journals._generic import Journal_ABC
+from src.search import SearchPageCallback
+
+SearchUnit = Tuple[Journal_ABC, str, int]
+
+# (journal, keyword, year) -> pages already stored with status 200
+CompletedPages = dict[Tuple[str, str, int], set[int]]
+
+
+class SearchScheduler:
+    """
+    Run (journal, keyword, year) search units on a shared worker pool.
+
+    At most maxWorkers units run at once overall, and at most
+    maxWorkersPerJournal of them target the same journal. Each journal has
+    its own pool of maxWorkersPerJournal threads, so units waiting on a busy
+    journal never hold a slot that another journal could use.
+    """
+
+    def __init__(
+        self,
+        maxWorkers: int = 8,
+        maxWorkersPerJournal: int = 4,
+    ) -> None:
+        self.maxWorkers: int = maxWorkers
+        self.maxWorkersPerJournal: int = maxWorkersPerJournal
+        self.workerSlots: BoundedSemaphore = BoundedSemaphore(value=maxWorkers)
+
+    def _runUnit(
+        self,
+        unit: SearchUnit,
+        completedPages: CompletedPages,
+        onPage: SearchPageCallback | None,
+    ) -> DataFrame:
+        journal, query, year = unit
+
+        with self.workerSlots:
+            return journal.searchJournal(
+                query=query,
+                year=year,
+                showProgress=False,
+                skipPages=completedPages.get(
+                    (journal.journalName, query, year),
+                    set(),
+                ),
+                onPage=onPage,
+            )
+
+    def run(
+        self,
+        units: List[SearchUnit],
+        completedPages: CompletedPages = {},
+        onPage: SearchPageCallback | None = None,
+    ) -> DataFrame:
+        """
+        Returns the concatenated search results in the order of units.
+
+        Pages listed in completedPages for a (journal, keyword, year) unit are
+        not fetched again. When onPage is given it is called with every
+        fetched page as it arrives, and pages are not kept in the returned
+        frame.
+        """
+        data: dict[int, DataFrame] = {}
+        journalNames: set[str] = {
+            journal.journalName for journal, _, _ in units
+        }
+
+        with Bar("Conducting searches...", max=len(units)) as bar:
+            with ExitStack() as stack:
+                executors: dict[str, ThreadPoolExecutor] = {
+                    name: stack.enter_context(
+                        ThreadPoolExecutor(
+                            max_workers=min(
+                                self.maxWorkersPerJournal,
+                                self.maxWorkers,
+                            )
+                        )
+                    )
+                    for name in journalNames
+                }
+
+                futures: dict[Future, int] = {
+                    executors[unit[0].journalName].submit(
+                        self._runUnit,
+                        unit=unit,
+                        completedPages=completedPages,
+                        onPage=onPage,
+                    ): idx
+                    for idx, unit in enumerate(units)
+                }
+
+                future: Future
+                for future in as_completed(fs=futures):
+                    data[futures[future]] = future.result()
+                    bar.next()
+
+        return pandas.concat(
+            objs=[data[idx] for idx in sorted(data)],
+            ignore_index=True,
+        )
@@ -1,18 +1,26 @@
 from itertools import product
 from typing import List, Tuple
 
-import pandas
 from pandas import DataFrame
 
 from src import SEARCH_KEYWORDS, YEARS
 from src.journals.nature import Nature
 from src.journals.plos import PLOS
 from src.journals.science import Science
+from src.search import SearchPageCallback
+from src.search.scheduler import CompletedPages, SearchScheduler
 from src.types import SearchResultsDF
 
 
-def _run(journal: Nature | PLOS) -> DataFrame:
-    data: List[DataFrame] = []
+def _run(
+    journal: Nature | PLOS,
+    scheduler: SearchScheduler | None = None,
+    completedPages: CompletedPages = {},
+    onPage: SearchPageCallback | None = None,
+) -> DataFrame:
+    if scheduler is None:
+        scheduler = SearchScheduler()
+
     products: List[Tuple[str, int]] = list(
         product(
             SEARCH_KEYWORDS["keyword"].tolist(),
@@ -20,14 +28,15 @@ def _run(journal: Nature | PLOS) -> DataFrame:
         )
     )
 
-    pair: Tuple[str, int]
-    for pair in products:
-        df: DataFrame = journal.searchJournal(query=pair[0], year=pair[1])
-        data.append(df)
-
-    df: DataFrame = pandas.concat(objs=data, ignore_index=True)
+    df: DataFrame = scheduler.run(
+        units=[(journal, query, year) for query, year in products],
+        completedPages=completedPages,
+        onPage=onPage,
+    )
 
-    SearchResultsDF(df_dict=df.to_dict(orient="records"))
+    # With onPage every page has already been stored and df is empty
+    if onPage is None:
+        SearchResultsDF(df_dict=df.to_dict(orient="records"))
 
     return df
 
@@ -41,9 +50,28 @@ def science() -> None:
     print(journal.message)
 
 
-def nature() -> DataFrame:
-    return _run(journal=Nature())
+def nature(
+    scheduler: SearchScheduler | None = None,
+    completedPages: CompletedPages = {},
+    onPage: SearchPageCallback | None = None,
+) -> DataFrame:
+    return _run(
+        journal=Nature(),
+        scheduler=scheduler,
+        completedPages=completedPages,
+        onPage=onPage,
+    )
 
 
-def plos() -> DataFrame:
-    return _run(journal=PLOS())
+def plos(
+    pageWorkers: int = 8,
+    scheduler: SearchScheduler | None = None,
+    completedPages: CompletedPages = {},
+    onPage: SearchPageCallback | None = None,
+) -> DataFrame:
+    return _run(
+        journal=PLOS(pageWorkers=pageWorkers),
+        scheduler=scheduler,
+        completedPages=completedPages,
+        onPage=onPage,
+    )
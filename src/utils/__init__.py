@@ -3,7 +3,9 @@ import sys
 from os.path import isfile
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import List
+from typing import Any, List
+
+import orjson
 
 # from pandas import DataFrame, Series
 # from progress.bar import Bar
@@ -11,6 +13,29 @@ from typing import List
 # from src.classes.journalGeneric import Journal_ABC
 
 
+def loads(s: str | bytes | bytearray | memoryview) -> Any:
+    """
+    Decode a JSON document with orjson. bytes (e.g. Response.content or a
+    line of a gzipped file) are parsed directly without decoding to str
+    first.
+    """
+    return orjson.loads(s)
+
+
+def dumpBytes(obj: Any) -> bytes:
+    """
+    Encode obj as compact UTF-8 JSON
+    """
+    return orjson.dumps(obj)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Encode obj as a compact JSON string
+    """
+    return orjson.dumps(obj).decode()
+
+
 def ifFileExistsExit(fps: List[Path]) -> None:
     fp: Path
     for fp in fps:
@@ -0,0 +1,96 @@
+from importlib import import_module
+from json import dumps, loads
+from types import ModuleType
+from typing import Any, List
+
+filterDocs: ModuleType = import_module(name="src.2_filterDocs")
+
+
+def fieldTopic(field: str) -> dict[str, Any]:
+    return {
+        "id": "https://openalex.org/T1",
+        "display_name": "Topic",
+        "score": 0.99,
+        "field": {
+            "id": "https://openalex.org/fields/1",
+            "display_name": field,
+        },
+    }
+
+
+# One OpenAlex list response of full records, as returned without select
+RESPONSE: dict[str, Any] = {
+    "meta": {"count": 2, "page": 1, "per_page": 200},
+    "results": [
+        {
+            "id": "https://openalex.org/W1",
+            "doi": "https://doi.org/10.1371/journal.pone.0000001",
+            "title": "A natural science paper",
+            "publication_date": "2020-01-01",
+            "cited_by_count": 3,
+            "authorships": [{"author": {"display_name": "A. Author"}}],
+            "abstract_inverted_index": {"Deep": [0], "learning": [1]},
+            "topics": [
+                fieldTopic(field="Physics and Astronomy"),
+                fieldTopic(field="Chemistry"),
+                fieldTopic(field="Earth and Planetary Sciences"),
+            ],
+        },
+        {
+            "id": "https://openalex.org/W2",
+            "doi": "https://doi.org/10.1371/journal.pone.0000002",
+            "title": "An uncited paper",
+            "publication_date": "2021-06-30",
+            "cited_by_count": 0,
+            "authorships": [],
+            "abstract_inverted_index": None,
+            "topics": [fieldTopic(field="Medicine")],
+        },
+    ],
+}
+
+
+def extractDocumentsBefore(payload: str) -> List[dict[str, Any]]:
+    """
+    The rows 2_filterDocs wrote when it decoded whole responses with json
+    """
+    rows: List[dict[str, Any]] = []
+
+    result: dict[str, Any]
+    for result in loads(s=payload)["results"]:
+        fields: List[str] = [
+            topic["field"]["display_name"] for topic in result["topics"][:3]
+        ]
+        fields += [""] * (3 - len(fields))
+
+        rows.append(
+            {
+                "doi": result["doi"],
+                "json": dumps(obj=result),
+                "citations": int(result["cited_by_count"]),
+                "field_1": fields[0],
+                "field_2": fields[1],
+                "field_3": fields[2],
+                "ns": len(filterDocs.FIELD_FILTER.intersection(fields)) > 2,
+            }
+        )
+
+    return rows
+
+
+def test_extractDocumentsMatchesWholeResponseDecoding() -> None:
+    payload: str = dumps(obj=RESPONSE)
+
+    before: List[dict[str, Any]] = extractDocumentsBefore(payload=payload)
+    after: List[dict[str, Any]] = filterDocs.extractDocuments(
+        payloads=[payload, ""]
+    ).to_pylist()
+
+    assert [row["ns"] for row in after] == [True, False]
+    assert len(after) == len(before)
+
+    row: dict[str, Any]
+    expected: dict[str, Any]
+    for row, expected in zip(after, before):
+        assert loads(s=row.pop("json")) == loads(s=expected.pop("json"))
+        assert row == expected